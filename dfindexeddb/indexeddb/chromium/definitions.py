@@ -77,7 +77,7 @@ class IndexMetaDataKeyType(IntEnum):
   MULTI_ENTRY_FLAG = 3
 
 
-class KeyPrefixType(Enum):
+class KeyPrefixType(IntEnum):
   """IndexedDB key prefix types."""
   GLOBAL_METADATA = 0
   DATABASE_METADATA = 1
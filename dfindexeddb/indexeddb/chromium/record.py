@@ -15,14 +15,18 @@
 """Parses Chromium IndexedDb structures."""
 from __future__ import annotations
 
+import collections
+import concurrent.futures
 from dataclasses import dataclass, field
-from datetime import datetime
-import io
+from datetime import datetime, timedelta
+import functools
+import itertools
+import logging
 import pathlib
+import struct
 import sys
-import traceback
-from typing import Any, BinaryIO, Generator, Optional, Tuple, Type, TypeVar, \
-    Union
+from typing import Any, BinaryIO, Deque, Dict, Generator, Iterable, List, \
+    Optional, Set, Tuple, Type, TypeVar, Union
 
 import snappy
 
@@ -35,6 +39,62 @@ from dfindexeddb.leveldb import utils
 
 T = TypeVar('T')
 
+_REPLACE_WITH_BLOB_HEADER = bytes((
+    definitions.BlinkSerializationTag.VERSION,
+    definitions.REQUIRES_PROCESSING_SSV_PSEUDO_VERSION,
+    definitions.REPLACE_WITH_BLOB))
+_COMPRESSED_WITH_SNAPPY_HEADER = bytes((
+    definitions.BlinkSerializationTag.VERSION,
+    definitions.REQUIRES_PROCESSING_SSV_PSEUDO_VERSION,
+    definitions.COMPRESSED_WITH_SNAPPY))
+
+_ARRAY_KEY_TYPE = definitions.IDBKeyType.ARRAY.value
+_EPOCH = datetime(1970, 1, 1)
+_UINT64_LE = struct.Struct('<Q')
+
+# The (database ID, object store ID, index ID) lengths for each possible key
+# prefix byte.  The lengths are encoded in the top 3 bits, the middle 3 bits
+# and the bottom 2 bits respectively, each stored as the length minus 1.
+_KEY_PREFIX_ID_LENGTHS = tuple(
+    (((prefix >> 5) & 0x07) + 1, ((prefix >> 2) & 0x07) + 1,
+     (prefix & 0x03) + 1)
+    for prefix in range(256))
+
+# The KeyPrefixTypes of the reserved index IDs for object store records.
+_INDEX_ID_TO_KEY_PREFIX_TYPE = {
+    1: definitions.KeyPrefixType.OBJECT_STORE_DATA,
+    2: definitions.KeyPrefixType.EXISTS_ENTRY,
+    3: definitions.KeyPrefixType.BLOB_ENTRY,
+}
+
+# The enum members by their raw value, which are faster to look up than
+# calling the enum.
+_DATABASE_METADATA_TYPES = {
+    member.value: member for member in definitions.DatabaseMetaDataKeyType}
+_EXTERNAL_OBJECT_TYPES = {
+    member.value: member for member in definitions.ExternalObjectType}
+_INDEX_METADATA_TYPES = {
+    member.value: member for member in definitions.IndexMetaDataKeyType}
+_OBJECT_STORE_METADATA_TYPES = {
+    member.value: member for member in definitions.ObjectStoreMetaDataKeyType}
+
+# The number of LevelDB records sent to a worker process at a time.
+_WORKER_CHUNK_SIZE = 256
+
+# The maximum number of chunks in flight per worker process.
+_WORKER_CHUNKS_PER_WORKER = 2
+
+
+def _DecodeUnsignedIntValue(decoder: utils.LevelDBDecoder) -> int:
+  """Decodes the remaining bytes as a little-endian unsigned integer.
+
+  Most of these values are 8 bytes long, which are unpacked with struct.
+  """
+  _, data = decoder.ReadBytes()
+  if len(data) == 8:
+    return _UINT64_LE.unpack(data)[0]
+  return int.from_bytes(data, byteorder='little', signed=False)
+
 
 @dataclass
 class KeyPrefix(utils.FromDecoderMixin):
@@ -67,23 +127,13 @@ class KeyPrefix(utils.FromDecoderMixin):
       the decoded KeyPrefix.
 
     Raises:
-      ParserError: when there is an invalid database/object store/index ID
-        length.
+      DecoderError: when there are not enough bytes for the database/object
+        store/index IDs.
     """
     offset, raw_prefix = decoder.ReadBytes(1)
 
-    database_id_length = (raw_prefix[0] & 0xE0 >> 5) + 1
-    object_store_id_length = (raw_prefix[0] & 0x1C >> 2) + 1
-    index_id_length = (raw_prefix[0] & 0x03) + 1
-
-    if database_id_length < 1 or database_id_length > 8:
-      raise errors.ParserError('Invalid database ID length')
-
-    if object_store_id_length < 1 or object_store_id_length > 8:
-      raise errors.ParserError('Invalid object store ID length')
-
-    if index_id_length < 1 or index_id_length > 4:
-      raise errors.ParserError('Invalid index ID length')
+    (database_id_length, object_store_id_length,
+     index_id_length) = _KEY_PREFIX_ID_LENGTHS[raw_prefix[0]]
 
     _, database_id = decoder.DecodeInt(database_id_length)
     _, object_store_id = decoder.DecodeInt(object_store_id_length)
@@ -107,14 +157,11 @@ class KeyPrefix(utils.FromDecoderMixin):
       return definitions.KeyPrefixType.GLOBAL_METADATA
     if not self.object_store_id:
       return definitions.KeyPrefixType.DATABASE_METADATA
-    if self.index_id == 1:
-      return definitions.KeyPrefixType.OBJECT_STORE_DATA
-    if self.index_id == 2:
-      return definitions.KeyPrefixType.EXISTS_ENTRY
-    if self.index_id == 3:
-      return definitions.KeyPrefixType.BLOB_ENTRY
     if self.index_id >= 30:
       return definitions.KeyPrefixType.INDEX_DATA
+    key_prefix_type = _INDEX_ID_TO_KEY_PREFIX_TYPE.get(self.index_id)
+    if key_prefix_type is not None:
+      return key_prefix_type
     raise errors.ParserError(
         f'Unknown KeyPrefixType (index_id={self.index_id})')
 
@@ -134,6 +181,18 @@ class IDBKey(utils.FromDecoderMixin):
 
   _MAXIMUM_DEPTH = 2000
 
+  KEY_TYPE_TO_DECODER = {
+      definitions.IDBKeyType.NULL: lambda decoder: None,
+      definitions.IDBKeyType.BINARY: (
+          lambda decoder: decoder.DecodeBlobWithLength()[1]),
+      definitions.IDBKeyType.STRING: (
+          lambda decoder: decoder.DecodeStringWithLength()[1]),
+      definitions.IDBKeyType.DATE: lambda decoder: _EPOCH + timedelta(
+          milliseconds=decoder.DecodeDouble()[1]),
+      definitions.IDBKeyType.NUMBER: lambda decoder: decoder.DecodeDouble()[1],
+      definitions.IDBKeyType.MIN_KEY: lambda decoder: None,
+  }
+
   @classmethod
   def FromDecoder(
       cls,
@@ -155,57 +214,46 @@ class IDBKey(utils.FromDecoderMixin):
       RecursionError: if maximum depth encountered during parsing.
     """
 
-    def RecursiveParse(depth: int) -> Tuple[
-        int, definitions.IDBKeyType, Union[
-            list, bytes, str, float, datetime, None
-        ]]:
-      """Recursively parses IDBKeys.
-
-      Args:
-        depth: the current recursion depth.
-
-      Returns:
-        A tuple of the offset, the key type and the key value (where the value
-          can be bytes, str, float, datetime or a list of these types).
-
-      Raises:
-        ParserError: on invalid IDBKeyType or invalid array length during
-          parsing.
-        RecursionError: if maximum depth encountered during parsing.
-      """
-      if depth == cls._MAXIMUM_DEPTH:
+    key_offset, key_type, key_value = None, None, None
+    # the arrays being parsed, each with the index of their next value.
+    array_stack: List[List[Any]] = []
+    while True:
+      if len(array_stack) == cls._MAXIMUM_DEPTH:
         raise RecursionError('Maximum recursion depth encountered during parse')
-      offset, key_type_value = decoder.DecodeInt(1)
-      key_type = definitions.IDBKeyType(key_type_value)
+      # the key type is kept as the raw byte and only the outermost key type
+      # is converted to an IDBKeyType.
+      offset, value_type = decoder.DecodeUint8()
+      is_array = value_type == _ARRAY_KEY_TYPE
 
-      if key_type == definitions.IDBKeyType.NULL:
-        value = None
-      elif key_type == definitions.IDBKeyType.ARRAY:
+      if is_array:
         _, length = decoder.DecodeVarint()
-        if length < 0:
+        # each array entry is at least one byte so the remaining bytes bound
+        # the length before pre-allocating the list.
+        if length < 0 or length > decoder.NumRemainingBytes():
           raise errors.ParserError('Invalid length encountered')
-        value = []
-        while length:
-          entry = RecursiveParse(depth + 1)
-          value.append(entry[2])
-          length -= 1
-      elif key_type == definitions.IDBKeyType.BINARY:
-        _, value = decoder.DecodeBlobWithLength()
-      elif key_type == definitions.IDBKeyType.STRING:
-        _, value = decoder.DecodeStringWithLength()
-      elif key_type == definitions.IDBKeyType.DATE:
-        _, raw_value = decoder.DecodeDouble()
-        value = datetime.utcfromtimestamp(raw_value/1000.0)
-      elif key_type == definitions.IDBKeyType.NUMBER:
-        _, value = decoder.DecodeDouble()
-      elif key_type == definitions.IDBKeyType.MIN_KEY:
-        value = None
+        value = [None] * length
+      else:
+        decode_function = cls.KEY_TYPE_TO_DECODER.get(value_type)
+        if not decode_function:
+          raise errors.ParserError('Invalid IndexedDbKeyType')
+        value = decode_function(decoder)
+
+      if array_stack:
+        array_entry = array_stack[-1]
+        array_entry[0][array_entry[1]] = value
+        array_entry[1] += 1
       else:
-        raise errors.ParserError('Invalid IndexedDbKeyType')
-      return offset, key_type, value
+        key_offset, key_type, key_value = offset, value_type, value
 
-    offset, key_type, value = RecursiveParse(0)
-    return cls(base_offset + offset, key_type, value)
+      if is_array and value:
+        array_stack.append([value, 0])
+      while array_stack and array_stack[-1][1] == len(array_stack[-1][0]):
+        array_stack.pop()
+      if not array_stack:
+        break
+
+    return cls(
+        base_offset + key_offset, definitions.IDBKeyType(key_type), key_value)
 
 
 @dataclass
@@ -237,14 +285,12 @@ class IDBKeyPath(utils.FromDecoderMixin):
       An IDBKeyPath
 
     Raises:
-      ParserError: on insufficient bytes or invalid array length during
-        parsing or unsupported key path type.
+      ParserError: on invalid array length during parsing or unsupported key
+        path type.
     """
-    buffer = decoder.stream.getvalue()  #pytype: disable=attribute-error
-    if len(buffer) < 3:
-      raise errors.ParserError('Insufficient bytes to parse.')
-
-    if buffer[0:2] != b'\x00\x00':
+    _, header = decoder.PeekBytes(min(3, decoder.NumRemainingBytes()))
+    # a key path without the type header is a legacy string key path.
+    if len(header) < 3 or header[0:2] != b'\x00\x00':
       offset, value = decoder.DecodeString()
       return IDBKeyPath(offset, definitions.IDBKeyPathType.STRING, value)
 
@@ -258,13 +304,12 @@ class IDBKeyPath(utils.FromDecoderMixin):
     elif key_path_type == definitions.IDBKeyPathType.STRING:
       offset, value = decoder.DecodeStringWithLength()
     elif key_path_type == definitions.IDBKeyPathType.ARRAY:
-      value = []
       offset, count = decoder.DecodeVarint()
-      if count < 0:
+      if count < 0 or count > decoder.NumRemainingBytes():
         raise errors.ParserError(f'Invalid array length {count}')
-      for _ in range(count):
-        _, entry = decoder.DecodeStringWithLength()
-        value.append(entry)
+      value = [None] * count
+      for i in range(count):
+        _, value[i] = decoder.DecodeStringWithLength()
     else:
       raise errors.ParserError(f'Unsupported key_path_type {key_path_type}.')
     return IDBKeyPath(base_offset + offset, key_path_type, value)
@@ -338,8 +383,9 @@ class BlobJournal(utils.FromDecoderMixin):
     offset = decoder.stream.tell()
     entries = []
 
-    # since there is no length prefix, consume the remaining buffer
-    while True:
+    # since there is no length prefix, consume the remaining buffer.  A
+    # truncated trailing entry is ignored.
+    while decoder.NumRemainingBytes():
       try:
         journal_entry = BlobJournalEntry.FromDecoder(decoder, base_offset)
       except errors.DecoderError:
@@ -360,6 +406,7 @@ class BaseIndexedDBKey:
     offset: the offset of the key (after the key_prefix).
     key_prefix: the key prefix.
   """
+  __slots__ = ('offset', 'key_prefix')
   offset: int
   key_prefix: KeyPrefix
 
@@ -387,7 +434,7 @@ class BaseIndexedDBKey:
     """
     if not value_data:
       return None
-    decoder = utils.LevelDBDecoder(io.BytesIO(value_data))
+    decoder = utils.LevelDBDecoder.FromBytes(value_data)
     return self.DecodeValue(decoder)
 
   @classmethod
@@ -439,189 +486,138 @@ class BaseIndexedDBKey:
     Returns:
       The decoded key.
     """
-    stream = io.BytesIO(raw_data)
-    return cls.FromStream(stream=stream, base_offset=base_offset)
+    decoder = utils.LevelDBDecoder.FromBytes(raw_data)
+    key_prefix = KeyPrefix.FromDecoder(decoder, base_offset=base_offset)
+    return cls.FromDecoder(
+        decoder=decoder, key_prefix=key_prefix, base_offset=base_offset)
 
 
 @dataclass
-class SchemaVersionKey(BaseIndexedDBKey):
-  """A schema version IndexedDb key."""
+class BaseGlobalMetaDataKey(BaseIndexedDBKey):
+  """A base class for global metadata keys without additional key fields.
 
-  def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
-    """Decodes the schema version value."""
-    return decoder.DecodeInt()[1]
+  Subclasses set METADATA_TYPE to the global metadata key type that follows
+  the key prefix.
+  """
+  __slots__ = ()
+
+  METADATA_TYPE = None
 
   @classmethod
   def FromDecoder(
-      cls,
+      cls: Type[T],
       decoder: utils.LevelDBDecoder,
       key_prefix: KeyPrefix,
       base_offset: int = 0
-  ) -> SchemaVersionKey:
-    """Decodes the schema version key."""
+  ) -> T:
+    """Decodes the global metadata key.
+
+    Raises:
+      ParserError: if the metadata key type does not match METADATA_TYPE.
+    """
     offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.SCHEMA_VERSION:
-      raise errors.ParserError('Not a SchemaVersionKey')
+    if key_type != cls.METADATA_TYPE:
+      raise errors.ParserError(f'Not a {cls.__name__}')
     return cls(offset=base_offset + offset, key_prefix=key_prefix)
 
 
 @dataclass
-class MaxDatabaseIdKey(BaseIndexedDBKey):
+class SchemaVersionKey(BaseGlobalMetaDataKey):
+  """A schema version IndexedDb key."""
+  __slots__ = ()
+
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.SCHEMA_VERSION
+
+  def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
+    """Decodes the schema version value."""
+    return decoder.DecodeInt()[1]
+
+
+@dataclass
+class MaxDatabaseIdKey(BaseGlobalMetaDataKey):
   """A max database ID IndexedDB key."""
+  __slots__ = ()
+
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.MAX_DATABASE_ID
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
     """Decodes the maximum database value."""
     return decoder.DecodeInt()[1]
 
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> MaxDatabaseIdKey:
-    """Decodes the maximum database key."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.MAX_DATABASE_ID:
-      raise errors.ParserError('Not a MaxDatabaseIdKey')
-    return cls(offset=base_offset + offset, key_prefix=key_prefix)
-
 
 @dataclass
-class DataVersionKey(BaseIndexedDBKey):
+class DataVersionKey(BaseGlobalMetaDataKey):
   """A data version IndexedDB key."""
+  __slots__ = ()
+
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.DATA_VERSION
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
     """Decodes the data version value."""
     return decoder.DecodeInt()[1]
 
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> DataVersionKey:
-    """Decodes the data version key."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.DATA_VERSION:
-      raise errors.ParserError('Not a DataVersionKey')
-    return cls(offset=base_offset + offset, key_prefix=key_prefix)
-
 
 @dataclass
-class RecoveryBlobJournalKey(BaseIndexedDBKey):
+class RecoveryBlobJournalKey(BaseGlobalMetaDataKey):
   """A recovery blob journal IndexedDB key."""
+  __slots__ = ()
+
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.RECOVERY_BLOB_JOURNAL
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> BlobJournal:
     """Decodes the recovery blob journal value."""
     return BlobJournal.FromDecoder(decoder)
 
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> RecoveryBlobJournalKey:
-    """Decodes the recovery blob journal key."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.RECOVERY_BLOB_JOURNAL:
-      raise errors.ParserError('Not a RecoveryBlobJournalKey')
-    return cls(offset=base_offset + offset, key_prefix=key_prefix)
-
 
 @dataclass
-class ActiveBlobJournalKey(BaseIndexedDBKey):
+class ActiveBlobJournalKey(BaseGlobalMetaDataKey):
   """An active blob journal IndexedDB key."""
+  __slots__ = ()
+
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.ACTIVE_BLOB_JOURNAL
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> BlobJournal:
     """Decodes the active blob journal value."""
     return BlobJournal.FromDecoder(decoder)
 
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> ActiveBlobJournalKey:
-    """Decodes the active blob journal value."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.ACTIVE_BLOB_JOURNAL:
-      raise errors.ParserError('Not a ActiveBlobJournalKey')
-    return cls(offset=base_offset + offset, key_prefix=key_prefix)
-
 
 @dataclass
-class EarliestSweepKey(BaseIndexedDBKey):
+class EarliestSweepKey(BaseGlobalMetaDataKey):
   """An earliest sweep IndexedDB key."""
+  __slots__ = ()
 
-  def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
-    """Decodes the earliest sweep value."""
-    _, data = decoder.ReadBytes()
-    return int.from_bytes(data, byteorder='little', signed=False)
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.EARLIEST_SWEEP
 
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> EarliestSweepKey:
+  def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
     """Decodes the earliest sweep value."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.EARLIEST_SWEEP:
-      raise errors.ParserError('Not a EarliestSweepKey')
-    return cls(offset=base_offset + offset, key_prefix=key_prefix)
+    return _DecodeUnsignedIntValue(decoder)
 
 
 @dataclass
-class EarliestCompactionTimeKey(BaseIndexedDBKey):
+class EarliestCompactionTimeKey(BaseGlobalMetaDataKey):
   """An earliest compaction time IndexedDB key."""
+  __slots__ = ()
+
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.EARLIEST_COMPACTION_TIME
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
     """Decodes the earliest compaction time value."""
-    _, data = decoder.ReadBytes()
-    return int.from_bytes(data, byteorder='little', signed=False)
-
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> EarliestCompactionTimeKey:
-    """Decodes the earliest compaction time key."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.EARLIEST_COMPACTION_TIME:
-      raise errors.ParserError('Not a EarliestCompactionTimeKey')
-    return cls(offset=base_offset + offset, key_prefix=key_prefix)
+    return _DecodeUnsignedIntValue(decoder)
 
 
 @dataclass
-class ScopesPrefixKey(BaseIndexedDBKey):
+class ScopesPrefixKey(BaseGlobalMetaDataKey):
   """A scopes prefix IndexedDB key."""
+  __slots__ = ()
+
+  METADATA_TYPE = definitions.GlobalMetadataKeyType.SCOPES_PREFIX
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> Optional[bytes]:
     """Decodes the scopes prefix value."""
-    if decoder.NumRemainingBytes:
+    if decoder.NumRemainingBytes():
       return decoder.ReadBytes()[1]
     return None
 
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> ScopesPrefixKey:
-    """Decodes the scopes prefix key."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.GlobalMetadataKeyType.SCOPES_PREFIX:
-      raise errors.ParserError('Not a ScopesPrefixKey')
-    return cls(offset=base_offset + offset, key_prefix=key_prefix)
-
 
 @dataclass
 class DatabaseFreeListKey(BaseIndexedDBKey):
@@ -630,6 +626,7 @@ class DatabaseFreeListKey(BaseIndexedDBKey):
   Attributes:
     database_id: the database ID.
   """
+  __slots__ = ('database_id',)
   database_id: int
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder):
@@ -661,6 +658,7 @@ class DatabaseNameKey(BaseIndexedDBKey):
     origin: the origin of the database.
     database_name: the database name.
   """
+  __slots__ = ('origin', 'database_name')
   origin: str
   database_name: str
 
@@ -685,13 +683,14 @@ class DatabaseNameKey(BaseIndexedDBKey):
     _, origin = decoder.DecodeStringWithLength()
     _, database_name = decoder.DecodeStringWithLength()
     return cls(
-        offset=base_offset + offset, key_prefix=key_prefix, origin=origin,
-        database_name=database_name)
+        offset=base_offset + offset, key_prefix=key_prefix,
+        origin=sys.intern(origin), database_name=sys.intern(database_name))
 
 
 @dataclass
 class GlobalMetaDataKey(BaseIndexedDBKey):
   """A GlobalMetaDataKey parser."""
+  __slots__ = ()
 
   METADATA_TYPE_TO_CLASS = {
       definitions.GlobalMetadataKeyType
@@ -745,9 +744,10 @@ class GlobalMetaDataKey(BaseIndexedDBKey):
       ParserError: if the key contains an unknown metadata key type.
     """
     _, metadata_value = decoder.PeekBytes(1)
-    metadata_type = definitions.GlobalMetadataKeyType(metadata_value[0])
 
-    key_class = cls.METADATA_TYPE_TO_CLASS.get(metadata_type)
+    # GlobalMetadataKeyType members hash and compare as ints, so the raw byte
+    # can be looked up directly without constructing the enum.
+    key_class = cls.METADATA_TYPE_TO_CLASS.get(metadata_value[0])
     if not key_class:
       raise errors.ParserError('Unknown metadata key type')
     return key_class.FromDecoder(
@@ -761,6 +761,7 @@ class ObjectStoreFreeListKey(BaseIndexedDBKey):
   Attributes:
     object_store_id: the ID of the object store containing the free list.
   """
+  __slots__ = ('object_store_id',)
   object_store_id: int
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder):
@@ -791,6 +792,7 @@ class IndexFreeListKey(BaseIndexedDBKey):
   Attributes:
     object_store_id: the ID of the object store containing the free list.
   """
+  __slots__ = ('object_store_id',)
   object_store_id: int
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder):
@@ -821,6 +823,7 @@ class ObjectStoreNamesKey(BaseIndexedDBKey):
   Attributes:
     object_store_name: the name of the object store.
   """
+  __slots__ = ('object_store_name',)
   object_store_name: str
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
@@ -839,7 +842,7 @@ class ObjectStoreNamesKey(BaseIndexedDBKey):
       raise errors.ParserError('Not am ObjectStoreNamesKey')
     _, object_store_name = decoder.DecodeStringWithLength()
     return cls(key_prefix=key_prefix, offset=base_offset + offset,
-               object_store_name=object_store_name)
+               object_store_name=sys.intern(object_store_name))
 
 
 @dataclass
@@ -849,6 +852,7 @@ class IndexNamesKey(BaseIndexedDBKey):
   Attributes:
     index_name: the name of the index.
   """
+  __slots__ = ('index_name',)
   index_name: str
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
@@ -868,93 +872,7 @@ class IndexNamesKey(BaseIndexedDBKey):
       raise errors.ParserError('Not am IndexNamesKey')
     _, index_name = decoder.DecodeStringWithLength()
     return cls(key_prefix=key_prefix, offset=base_offset + offset,
-               index_name=index_name)
-
-
-@dataclass
-class DatabaseMetaDataKey(BaseIndexedDBKey):
-  """An IndexedDB database metadata key.
-
-  Attributes:
-    metadata_type: the type of metadata that the key value contains.
-  """
-  metadata_type: definitions.DatabaseMetaDataKeyType
-
-  def DecodeValue(
-      self, decoder: utils.LevelDBDecoder) -> Union[str, int]:
-    """Decodes the database metadata value."""
-    if (self.metadata_type ==
-        definitions.DatabaseMetaDataKeyType.ORIGIN_NAME):
-      return decoder.DecodeString()[1]
-    if (self.metadata_type ==
-        definitions.DatabaseMetaDataKeyType.DATABASE_NAME):
-      return decoder.DecodeString()[1]
-    if (self.metadata_type ==
-        definitions.DatabaseMetaDataKeyType.IDB_STRING_VERSION_DATA):
-      return decoder.DecodeString()[1]
-    if (self.metadata_type ==
-        definitions.DatabaseMetaDataKeyType.MAX_ALLOCATED_OBJECT_STORE_ID):
-      return decoder.DecodeInt()[1]
-    if (self.metadata_type ==
-        definitions.DatabaseMetaDataKeyType.IDB_INTEGER_VERSION):
-      return decoder.DecodeVarint()[1]
-    if (self.metadata_type ==
-        definitions.DatabaseMetaDataKeyType
-            .BLOB_NUMBER_GENERATOR_CURRENT_NUMBER):
-      return decoder.DecodeVarint()[1]
-    raise errors.ParserError(
-        f'Unknown database metadata type {self.metadata_type}')
-
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> Union[
-      DatabaseMetaDataKey,
-      IndexFreeListKey,
-      IndexMetaDataKey,
-      IndexNamesKey,
-      ObjectStoreFreeListKey,
-      ObjectStoreMetaDataKey,
-      ObjectStoreNamesKey]:
-    """Decodes the database metadata key."""
-    offset, metadata_value = decoder.PeekBytes(1)
-    metadata_type = definitions.DatabaseMetaDataKeyType(metadata_value[0])
-
-    if metadata_type in (
-        definitions.DatabaseMetaDataKeyType.ORIGIN_NAME,
-        definitions.DatabaseMetaDataKeyType.DATABASE_NAME,
-        definitions.DatabaseMetaDataKeyType.IDB_STRING_VERSION_DATA,
-        definitions.DatabaseMetaDataKeyType.MAX_ALLOCATED_OBJECT_STORE_ID,
-        definitions.DatabaseMetaDataKeyType.IDB_INTEGER_VERSION,
-        definitions.DatabaseMetaDataKeyType
-            .BLOB_NUMBER_GENERATOR_CURRENT_NUMBER):
-      return cls(key_prefix=key_prefix, offset=base_offset + offset,
-                 metadata_type=metadata_type)
-    if metadata_type == definitions.DatabaseMetaDataKeyType.INDEX_META_DATA:
-      return IndexMetaDataKey.FromDecoder(
-          decoder, key_prefix, base_offset)
-    if (metadata_type ==
-        definitions.DatabaseMetaDataKeyType.OBJECT_STORE_META_DATA):
-      return ObjectStoreMetaDataKey.FromDecoder(
-          decoder, key_prefix, base_offset)
-    if (metadata_type ==
-        definitions.DatabaseMetaDataKeyType.OBJECT_STORE_FREE_LIST):
-      return ObjectStoreFreeListKey.FromDecoder(
-          decoder, key_prefix, base_offset)
-    if metadata_type == definitions.DatabaseMetaDataKeyType.INDEX_FREE_LIST:
-      return IndexFreeListKey.FromDecoder(
-          decoder, key_prefix, base_offset)
-    if (metadata_type ==
-        definitions.DatabaseMetaDataKeyType.OBJECT_STORE_NAMES):
-      return ObjectStoreNamesKey.FromDecoder(
-          decoder, key_prefix, base_offset)
-    if metadata_type == definitions.DatabaseMetaDataKeyType.INDEX_NAMES:
-      return IndexNamesKey.FromDecoder(
-          decoder, key_prefix, base_offset)
-    raise errors.ParserError(f'unknown database metadata type {metadata_type}.')
+               index_name=sys.intern(index_name))
 
 
 @dataclass
@@ -965,38 +883,41 @@ class ObjectStoreMetaDataKey(BaseIndexedDBKey):
     object_store_id: the ID of the object store.
     metadata_type: the object store metadata type.
   """
+  __slots__ = ('object_store_id', 'metadata_type')
   object_store_id: int
   metadata_type: definitions.ObjectStoreMetaDataKeyType
 
+  METADATA_TYPE_TO_DECODER = {
+      definitions.ObjectStoreMetaDataKeyType
+          .OBJECT_STORE_NAME: utils.LevelDBDecoder.DecodeStringValue,
+      definitions.ObjectStoreMetaDataKeyType
+          .KEY_PATH: IDBKeyPath.FromDecoder,
+      definitions.ObjectStoreMetaDataKeyType
+          .AUTO_INCREMENT_FLAG: utils.LevelDBDecoder.DecodeBoolValue,
+      definitions.ObjectStoreMetaDataKeyType
+          .IS_EVICTABLE: utils.LevelDBDecoder.DecodeBoolValue,
+      definitions.ObjectStoreMetaDataKeyType
+          .LAST_VERSION_NUMBER: (
+              functools.partial(
+                  utils.LevelDBDecoder.DecodeIntValue, signed=False)),
+      definitions.ObjectStoreMetaDataKeyType
+          .MAXIMUM_ALLOCATED_INDEX_ID: utils.LevelDBDecoder.DecodeIntValue,
+      definitions.ObjectStoreMetaDataKeyType
+          .HAS_KEY_PATH: utils.LevelDBDecoder.DecodeBoolValue,
+      definitions.ObjectStoreMetaDataKeyType
+          .KEY_GENERATOR_CURRENT_NUMBER: (
+              utils.LevelDBDecoder.DecodeIntValue),
+  }
+
   def DecodeValue(
       self,
       decoder: utils.LevelDBDecoder
   ) -> Union[IDBKeyPath, str, bool, int]:
     """Decodes the object store metadata value."""
-    if (self.metadata_type ==
-        definitions.ObjectStoreMetaDataKeyType.OBJECT_STORE_NAME):
-      return decoder.DecodeString()[1]
-    if self.metadata_type == definitions.ObjectStoreMetaDataKeyType.KEY_PATH:
-      return IDBKeyPath.FromDecoder(decoder)
-    if (self.metadata_type ==
-        definitions.ObjectStoreMetaDataKeyType.AUTO_INCREMENT_FLAG):
-      return decoder.DecodeBool()[1]
-    if (self.metadata_type ==
-        definitions.ObjectStoreMetaDataKeyType.IS_EVICTABLE):
-      return decoder.DecodeBool()[1]
-    if (self.metadata_type ==
-        definitions.ObjectStoreMetaDataKeyType.LAST_VERSION_NUMBER):
-      return decoder.DecodeInt(signed=False)[1]
-    if (self.metadata_type ==
-        definitions.ObjectStoreMetaDataKeyType.MAXIMUM_ALLOCATED_INDEX_ID):
-      return decoder.DecodeInt()[1]
-    if (self.metadata_type ==
-        definitions.ObjectStoreMetaDataKeyType.HAS_KEY_PATH):
-      return decoder.DecodeBool()[1]
-    if (self.metadata_type ==
-        definitions.ObjectStoreMetaDataKeyType.KEY_GENERATOR_CURRENT_NUMBER):
-      return decoder.DecodeInt()[1]
-    raise errors.ParserError(f'Unknown metadata type {self.metadata_type}')
+    decode_function = self.METADATA_TYPE_TO_DECODER.get(self.metadata_type)
+    if not decode_function:
+      raise errors.ParserError(f'Unknown metadata type {self.metadata_type}')
+    return decode_function(decoder)
 
   @classmethod
   def FromDecoder(
@@ -1013,11 +934,153 @@ class ObjectStoreMetaDataKey(BaseIndexedDBKey):
 
     _, object_store_id = decoder.DecodeVarint()
     _, metadata_value = decoder.DecodeUint8()
-    metadata_type = definitions.ObjectStoreMetaDataKeyType(metadata_value)
+    metadata_type = _OBJECT_STORE_METADATA_TYPES.get(metadata_value)
+    if metadata_type is None:
+      raise errors.ParserError(
+          f'Unknown object store metadata type {metadata_value}')
     return cls(
         offset=base_offset + offset, key_prefix=key_prefix,
         object_store_id=object_store_id, metadata_type=metadata_type)
 
+
+@dataclass
+class IndexMetaDataKey(BaseIndexedDBKey):
+  """An IndexedDB meta data key.
+
+  Attributes:
+    object_store_id: the ID of the object store.
+    index_id: the index ID.
+    metadata_type: the metadata key type.
+  """
+  __slots__ = ('object_store_id', 'index_id', 'metadata_type')
+  object_store_id: int
+  index_id: int
+  metadata_type: definitions.IndexMetaDataKeyType
+
+  METADATA_TYPE_TO_DECODER = {
+      definitions.IndexMetaDataKeyType
+          .INDEX_NAME: utils.LevelDBDecoder.DecodeStringValue,
+      definitions.IndexMetaDataKeyType
+          .KEY_PATH: IDBKeyPath.FromDecoder,
+      definitions.IndexMetaDataKeyType
+          .MULTI_ENTRY_FLAG: utils.LevelDBDecoder.DecodeBoolValue,
+      definitions.IndexMetaDataKeyType
+          .UNIQUE_FLAG: utils.LevelDBDecoder.DecodeBoolValue,
+  }
+
+  def DecodeValue(
+      self,
+      decoder: utils.LevelDBDecoder
+  ) -> Union[bool, IDBKeyPath, str]:
+    """Decodes the index metadata value."""
+    decode_function = self.METADATA_TYPE_TO_DECODER.get(self.metadata_type)
+    if not decode_function:
+      raise errors.ParserError(
+          f'Unknown index metadata type {self.metadata_type}')
+    return decode_function(decoder)
+
+  @classmethod
+  def FromDecoder(
+      cls,
+      decoder: utils.LevelDBDecoder,
+      key_prefix: KeyPrefix,
+      base_offset: int = 0
+  ) -> IndexMetaDataKey:
+    """Decodes the index metadata key."""
+    offset, key_type = decoder.DecodeUint8()
+    if key_type != definitions.DatabaseMetaDataKeyType.INDEX_META_DATA:
+      raise errors.ParserError('Not an IndexMetaDataKey.')
+    _, object_store_id = decoder.DecodeVarint()
+    _, index_id = decoder.DecodeVarint()
+    _, metadata_value = decoder.DecodeUint8()
+    metadata_type = _INDEX_METADATA_TYPES.get(metadata_value)
+    if metadata_type is None:
+      raise errors.ParserError(f'Unknown index metadata type {metadata_value}')
+    return cls(offset=base_offset + offset, key_prefix=key_prefix,
+               object_store_id=object_store_id, index_id=index_id,
+               metadata_type=metadata_type)
+
+
+@dataclass
+class DatabaseMetaDataKey(BaseIndexedDBKey):
+  """An IndexedDB database metadata key.
+
+  Attributes:
+    metadata_type: the type of metadata that the key value contains.
+  """
+  __slots__ = ('metadata_type',)
+  metadata_type: definitions.DatabaseMetaDataKeyType
+
+  METADATA_TYPE_TO_DECODER = {
+      definitions.DatabaseMetaDataKeyType
+          .ORIGIN_NAME: utils.LevelDBDecoder.DecodeStringValue,
+      definitions.DatabaseMetaDataKeyType
+          .DATABASE_NAME: utils.LevelDBDecoder.DecodeStringValue,
+      definitions.DatabaseMetaDataKeyType
+          .IDB_STRING_VERSION_DATA: utils.LevelDBDecoder.DecodeStringValue,
+      definitions.DatabaseMetaDataKeyType
+          .MAX_ALLOCATED_OBJECT_STORE_ID: (
+              utils.LevelDBDecoder.DecodeIntValue),
+      definitions.DatabaseMetaDataKeyType
+          .IDB_INTEGER_VERSION: utils.LevelDBDecoder.DecodeVarintValue,
+      definitions.DatabaseMetaDataKeyType
+          .BLOB_NUMBER_GENERATOR_CURRENT_NUMBER: (
+              utils.LevelDBDecoder.DecodeVarintValue),
+  }
+
+  METADATA_TYPE_TO_CLASS = {
+      definitions.DatabaseMetaDataKeyType
+          .INDEX_FREE_LIST: IndexFreeListKey,
+      definitions.DatabaseMetaDataKeyType
+          .INDEX_META_DATA: IndexMetaDataKey,
+      definitions.DatabaseMetaDataKeyType
+          .INDEX_NAMES: IndexNamesKey,
+      definitions.DatabaseMetaDataKeyType
+          .OBJECT_STORE_FREE_LIST: ObjectStoreFreeListKey,
+      definitions.DatabaseMetaDataKeyType
+          .OBJECT_STORE_META_DATA: ObjectStoreMetaDataKey,
+      definitions.DatabaseMetaDataKeyType
+          .OBJECT_STORE_NAMES: ObjectStoreNamesKey,
+  }
+
+  def DecodeValue(
+      self, decoder: utils.LevelDBDecoder) -> Union[str, int]:
+    """Decodes the database metadata value."""
+    decode_function = self.METADATA_TYPE_TO_DECODER.get(self.metadata_type)
+    if not decode_function:
+      raise errors.ParserError(
+          f'Unknown database metadata type {self.metadata_type}')
+    return decode_function(decoder)
+
+  @classmethod
+  def FromDecoder(
+      cls,
+      decoder: utils.LevelDBDecoder,
+      key_prefix: KeyPrefix,
+      base_offset: int = 0
+  ) -> Union[
+      DatabaseMetaDataKey,
+      IndexFreeListKey,
+      IndexMetaDataKey,
+      IndexNamesKey,
+      ObjectStoreFreeListKey,
+      ObjectStoreMetaDataKey,
+      ObjectStoreNamesKey]:
+    """Decodes the database metadata key."""
+    offset, metadata_value = decoder.ReadBytes(1)
+    if metadata_value[0] in cls.METADATA_TYPE_TO_DECODER:
+      return cls(key_prefix=key_prefix, offset=base_offset + offset,
+                 metadata_type=_DATABASE_METADATA_TYPES[metadata_value[0]])
+
+    key_class = cls.METADATA_TYPE_TO_CLASS.get(metadata_value[0])
+    if not key_class:
+      raise errors.ParserError(
+          f'unknown database metadata type {metadata_value[0]}.')
+    # the key class decodes the metadata type byte itself.
+    decoder.stream.seek(offset)
+    return key_class.FromDecoder(decoder, key_prefix, base_offset)
+
+
 @dataclass
 class ObjectStoreDataValue:
   """The parsed values from an ObjectStoreDataKey.
@@ -1029,6 +1092,7 @@ class ObjectStoreDataValue:
     blob_offset: the blob offset, only valid if wrapped.
     value: the blink serialized value, only valid if not wrapped.
   """
+  __slots__ = ('version', 'is_wrapped', 'blob_size', 'blob_offset', 'value')
   version: int
   is_wrapped: bool
   blob_size: Optional[int]
@@ -1043,6 +1107,7 @@ class ObjectStoreDataKey(BaseIndexedDBKey):
   Attributes:
     encoded_user_key: the encoded user key.
   """
+  __slots__ = ('encoded_user_key',)
   encoded_user_key: IDBKey
 
   def DecodeValue(
@@ -1050,18 +1115,15 @@ class ObjectStoreDataKey(BaseIndexedDBKey):
       decoder: utils.LevelDBDecoder
   ) -> ObjectStoreDataValue:
     """Decodes the object store data value."""
-    _, version = decoder.DecodeVarint()
+    version = decoder.DecodeVarintValue()
 
-    _, wrapped_header_bytes = decoder.PeekBytes(3)
-    if len(wrapped_header_bytes) != 3:
+    offset, blink_bytes = decoder.ReadBytes()
+    if len(blink_bytes) < 3:
       raise errors.DecoderError('Insufficient bytes')
+    wrapped_header_bytes = blink_bytes[:3]
 
-    if (wrapped_header_bytes[0] ==
-            definitions.BlinkSerializationTag.VERSION and
-        wrapped_header_bytes[1] ==
-            definitions.REQUIRES_PROCESSING_SSV_PSEUDO_VERSION and
-        wrapped_header_bytes[2] == definitions.REPLACE_WITH_BLOB):
-      _ = decoder.ReadBytes(3)
+    if wrapped_header_bytes == _REPLACE_WITH_BLOB_HEADER:
+      decoder.stream.seek(offset + 3)
       _, blob_size = decoder.DecodeVarint()
       _, blob_offset = decoder.DecodeVarint()
       return ObjectStoreDataValue(
@@ -1070,15 +1132,8 @@ class ObjectStoreDataKey(BaseIndexedDBKey):
           blob_size=blob_size,
           blob_offset=blob_offset,
           value=None)
-    _, blink_bytes = decoder.ReadBytes()
-    is_wrapped = False
-    if (
-        wrapped_header_bytes[0] ==
-        definitions.BlinkSerializationTag.VERSION and
-        wrapped_header_bytes[1] ==
-        definitions.REQUIRES_PROCESSING_SSV_PSEUDO_VERSION and
-        wrapped_header_bytes[2] == definitions.COMPRESSED_WITH_SNAPPY):
-      is_wrapped = True
+    is_wrapped = wrapped_header_bytes == _COMPRESSED_WITH_SNAPPY_HEADER
+    if is_wrapped:
       # ignore the wrapped header bytes when decompressing
       blink_bytes = snappy.decompress(blink_bytes[3:])
     blink_value = blink.V8ScriptValueDecoder.FromBytes(blink_bytes)
@@ -1114,12 +1169,12 @@ class ExistsEntryKey(BaseIndexedDBKey):
   Attributes:
     encoded_user_key: the encoded user key.
   """
+  __slots__ = ('encoded_user_key',)
   encoded_user_key: IDBKey
 
   def DecodeValue(self, decoder: utils.LevelDBDecoder) -> int:
     """Decodes the exists entry value."""
-    _, data = decoder.ReadBytes()
-    return int.from_bytes(data, byteorder='little', signed=False)
+    return _DecodeUnsignedIntValue(decoder)
 
   @classmethod
   def FromDecoder(
@@ -1145,6 +1200,7 @@ class IndexDataKey(BaseIndexedDBKey):
     sequence_number: the sequence number of the data key.
     encoded_primary_key: the encoded primary key.
   """
+  __slots__ = ('encoded_user_key', 'sequence_number', 'encoded_primary_key')
   encoded_user_key: IDBKey
   sequence_number: Optional[int]
   encoded_primary_key: Optional[IDBKey]
@@ -1163,16 +1219,18 @@ class IndexDataKey(BaseIndexedDBKey):
       base_offset: int = 0
   ) -> IndexDataKey:
     """Decodes the index data key."""
-    offset = decoder.stream.tell()
+    tell = decoder.stream.tell
+    offset = tell()
+    end_offset = offset + decoder.NumRemainingBytes()
     encoded_user_key = IDBKey.FromDecoder(decoder, offset)
 
-    if decoder.NumRemainingBytes() > 0:
-      _, sequence_number = decoder.DecodeVarint()
+    if tell() < end_offset:
+      sequence_number = decoder.DecodeVarintValue()
     else:
       sequence_number = None
 
-    if decoder.NumRemainingBytes() > 0:
-      encoded_primary_key_offset = decoder.stream.tell()
+    encoded_primary_key_offset = tell()
+    if encoded_primary_key_offset < end_offset:
       encoded_primary_key = IDBKey.FromDecoder(
           decoder, encoded_primary_key_offset)
     else:
@@ -1193,6 +1251,7 @@ class BlobEntryKey(BaseIndexedDBKey):
   Attributes:
     user_key: the user/primary key.
   """
+  __slots__ = ('user_key',)
   user_key: IDBKey
 
   def DecodeValue(
@@ -1223,6 +1282,7 @@ class IndexedDbKey(BaseIndexedDBKey):
 
   A factory class for parsing IndexedDB keys.
   """
+  __slots__ = ()
 
   METADATA_TYPE_TO_CLASS = {
       definitions.KeyPrefixType.BLOB_ENTRY: BlobEntryKey,
@@ -1265,54 +1325,37 @@ class IndexedDbKey(BaseIndexedDBKey):
         base_offset=base_offset)
 
 
-@dataclass
-class IndexMetaDataKey(BaseIndexedDBKey):
-  """An IndexedDB meta data key.
+def _DecodeBlobExternalObject(
+    decoder: utils.LevelDBDecoder) -> Dict[str, Any]:
+  """Decodes the fields of a blob external object entry."""
+  _, blob_number = decoder.DecodeVarint()
+  _, mime_type = decoder.DecodeStringWithLength()
+  _, size = decoder.DecodeVarint()
+  return {
+      'blob_number': blob_number, 'mime_type': mime_type, 'size': size,
+      'filename': None, 'last_modified': None, 'token': None}
 
-  Attributes:
-    object_store_id: the ID of the object store.
-    index_id: the index ID.
-    metadata_type: the metadata key type.
-  """
-  object_store_id: int
-  index_id: int
-  metadata_type: definitions.IndexMetaDataKeyType
 
-  def DecodeValue(
-      self,
-      decoder: utils.LevelDBDecoder
-  ) -> Union[bool, IDBKeyPath, str]:
-    """Decodes the index metadata value."""
-    if self.metadata_type == definitions.IndexMetaDataKeyType.INDEX_NAME:
-      return decoder.DecodeString()[1]
-    if self.metadata_type == definitions.IndexMetaDataKeyType.KEY_PATH:
-      return IDBKeyPath.FromDecoder(decoder)
-    if (self.metadata_type ==
-        definitions.IndexMetaDataKeyType.MULTI_ENTRY_FLAG):
-      return decoder.DecodeBool()[1]
-    if self.metadata_type == definitions.IndexMetaDataKeyType.UNIQUE_FLAG:
-      return decoder.DecodeBool()[1]
-    raise errors.ParserError(
-        f'Unknown index metadata type {self.metadata_type}')
+def _DecodeFileExternalObject(
+    decoder: utils.LevelDBDecoder) -> Dict[str, Any]:
+  """Decodes the fields of a file external object entry."""
+  _, blob_number = decoder.DecodeVarint()
+  _, mime_type = decoder.DecodeStringWithLength()
+  _, size = decoder.DecodeVarint()
+  _, filename = decoder.DecodeStringWithLength()
+  _, last_modified = decoder.DecodeVarint()
+  return {
+      'blob_number': blob_number, 'mime_type': mime_type, 'size': size,
+      'filename': filename, 'last_modified': last_modified, 'token': None}
 
-  @classmethod
-  def FromDecoder(
-      cls,
-      decoder: utils.LevelDBDecoder,
-      key_prefix: KeyPrefix,
-      base_offset: int = 0
-  ) -> IndexMetaDataKey:
-    """Decodes the index metadata key."""
-    offset, key_type = decoder.DecodeUint8()
-    if key_type != definitions.DatabaseMetaDataKeyType.INDEX_META_DATA:
-      raise errors.ParserError('Not an IndexMetaDataKey.')
-    _, object_store_id = decoder.DecodeVarint()
-    _, index_id = decoder.DecodeVarint()
-    _, metadata_bytes = decoder.ReadBytes(1)
-    metadata_type = definitions.IndexMetaDataKeyType(metadata_bytes[0])
-    return cls(offset=base_offset + offset, key_prefix=key_prefix,
-               object_store_id=object_store_id, index_id=index_id,
-               metadata_type=metadata_type)
+
+def _DecodeFileSystemAccessHandleExternalObject(
+    decoder: utils.LevelDBDecoder) -> Dict[str, Any]:
+  """Decodes the fields of a file system access handle external object."""
+  _, token = decoder.DecodeBlobWithLength()
+  return {
+      'blob_number': None, 'mime_type': None, 'size': None,
+      'filename': None, 'last_modified': None, 'token': token}
 
 
 @dataclass
@@ -1340,6 +1383,16 @@ class ExternalObjectEntry(utils.FromDecoderMixin):
   last_modified: Optional[int]  # microseconds
   token: Optional[bytes]
 
+  OBJECT_TYPE_TO_DECODER = {
+      definitions.ExternalObjectType
+          .BLOB: _DecodeBlobExternalObject,
+      definitions.ExternalObjectType
+          .FILE: _DecodeFileExternalObject,
+      definitions.ExternalObjectType
+          .FILE_SYSTEM_ACCESS_HANDLE: (
+              _DecodeFileSystemAccessHandleExternalObject),
+  }
+
   @classmethod
   def FromDecoder(
       cls,
@@ -1348,35 +1401,13 @@ class ExternalObjectEntry(utils.FromDecoderMixin):
   ) -> ExternalObjectEntry:
     """Decodes the external object entry."""
     offset, object_type_value = decoder.DecodeUint8()
-    object_type = definitions.ExternalObjectType(object_type_value)
-    if (object_type in
-        (definitions.ExternalObjectType.BLOB,
-         definitions.ExternalObjectType.FILE)):
-      _, blob_number = decoder.DecodeVarint()
-      _, mime_type = decoder.DecodeStringWithLength()
-      _, size = decoder.DecodeVarint()
-      if object_type == definitions.ExternalObjectType.FILE:
-        _, filename = decoder.DecodeStringWithLength()
-        _, last_modified = decoder.DecodeVarint()
-      else:
-        filename = None
-        last_modified = None
-      token = None
-    else:
-      if (object_type ==
-          definitions.ExternalObjectType.FILE_SYSTEM_ACCESS_HANDLE):
-        _, token = decoder.DecodeBlobWithLength()
-      else:
-        token = None
-      blob_number = None
-      mime_type = None
-      size = None
-      filename = None
-      last_modified = None
-
+    object_type = _EXTERNAL_OBJECT_TYPES.get(object_type_value)
+    if object_type is None:
+      raise errors.ParserError(
+          f'Unknown external object type {object_type_value}')
+    decode_function = cls.OBJECT_TYPE_TO_DECODER[object_type]
     return cls(offset=base_offset + offset, object_type=object_type,
-        blob_number=blob_number, mime_type=mime_type, size=size,
-        filename=filename, last_modified=last_modified, token=token)
+               **decode_function(decoder))
 
 
 @dataclass
@@ -1435,6 +1466,9 @@ class IndexedDBRecord:
         originated from a log file or the level could not be determined.
     recovered: True if the record is a recovered record.
   """
+  __slots__ = (
+      'path', 'offset', 'key', 'value', 'sequence_number', 'type', 'level',
+      'recovered')
   path: str
   offset: int
   key: Any
@@ -1447,19 +1481,29 @@ class IndexedDBRecord:
   @classmethod
   def FromLevelDBRecord(
       cls,
-      db_record: record.LevelDBRecord
+      db_record: record.LevelDBRecord,
+      parse_value_for: Optional[Set[Type[BaseIndexedDBKey]]] = None
   ) -> IndexedDBRecord:
-    """Returns an IndexedDBRecord from a ParsedInternalKey."""
+    """Returns an IndexedDBRecord from a ParsedInternalKey.
+
+    Args:
+      db_record: the leveldb record.
+      parse_value_for: if set, only the values of keys with one of these key
+          classes are parsed, otherwise the value is None.  Use
+          {ObjectStoreDataKey} to skip decoding all the metadata values.
+    """
     idb_key = IndexedDbKey.FromBytes(
         db_record.record.key, base_offset=db_record.record.offset)
-    idb_value = idb_key.ParseValue(db_record.record.value)
+    if parse_value_for is None or type(idb_key) in parse_value_for:
+      idb_value = idb_key.ParseValue(db_record.record.value)
+    else:
+      idb_value = None
     return cls(
         path=db_record.path,
         offset=db_record.record.offset,
         key=idb_key,
         value=idb_value,
-        sequence_number=db_record.record.sequence_number if hasattr(
-            db_record.record, 'sequence_number') else None,
+        sequence_number=db_record.record.sequence_number,
         type=db_record.record.record_type,
         level=db_record.level,
         recovered=db_record.recovered)
@@ -1467,22 +1511,156 @@ class IndexedDBRecord:
   @classmethod
   def FromFile(
       cls,
-      file_path: pathlib.Path
+      file_path: pathlib.Path,
+      parse_value_for: Optional[Set[Type[BaseIndexedDBKey]]] = None
   ) -> Generator[IndexedDBRecord, None, None]:
-    """Yields IndexedDBRecords from a file."""
+    """Yields IndexedDBRecords from a file.
+
+    Args:
+      file_path: the file path.
+      parse_value_for: if set, only the values of keys with one of these key
+          classes are parsed.
+    """
     for db_record in record.LevelDBRecord.FromFile(file_path):
-      try:
-        yield cls.FromLevelDBRecord(db_record)
-      except(
-          errors.ParserError,
-          errors.DecoderError,
-          NotImplementedError) as err:
-        print((
-            'Error parsing Indexeddb record: '
-            f'{err} at offset {db_record.record.offset} in '
-            f'{db_record.path}'),
-            file=sys.stderr)
-        print(f'Traceback: {traceback.format_exc()}', file=sys.stderr)
+      idb_record = _ParseLevelDBRecord(
+          db_record, parse_value_for=parse_value_for)
+      if idb_record is not None:
+        yield idb_record
+
+
+@dataclass
+class _RecordParseError:
+  """An error raised while parsing an IndexedDBRecord in a worker process.
+
+  Attributes:
+    error: the error message.
+    offset: the offset of the LevelDB record.
+    path: the path of the file containing the LevelDB record.
+    traceback: the formatted traceback of the error, if requested.
+  """
+  error: str
+  offset: int
+  path: str
+  traceback: Optional[str] = None
+
+
+def _TryParseLevelDBRecord(
+    leveldb_record: record.LevelDBRecord,
+    parse_value_for: Optional[Set[Type[BaseIndexedDBKey]]] = None,
+    include_traceback: bool = False
+) -> Union[IndexedDBRecord, _RecordParseError]:
+  """Returns an IndexedDBRecord from a LevelDBRecord or the parse error.
+
+  Args:
+    leveldb_record: the leveldb record.
+    parse_value_for: if set, only the values of keys with one of these key
+        classes are parsed.
+    include_traceback: True to include the formatted traceback in the parse
+        error.
+  """
+  try:
+    return IndexedDBRecord.FromLevelDBRecord(
+        leveldb_record, parse_value_for=parse_value_for)
+  except(
+      errors.ParserError,
+      errors.DecoderError,
+      NotImplementedError) as err:
+    return _RecordParseError(
+        error=str(err),
+        offset=leveldb_record.record.offset,
+        path=leveldb_record.path,
+        traceback=(
+            logging.Formatter().formatException(sys.exc_info())
+            if include_traceback else None))
+
+
+def _TryParseLevelDBRecords(
+    leveldb_records: List[record.LevelDBRecord],
+    parse_value_for: Optional[Set[Type[BaseIndexedDBKey]]] = None,
+    include_traceback: bool = False
+) -> List[Union[IndexedDBRecord, _RecordParseError]]:
+  """Returns the IndexedDBRecords or parse errors from LevelDBRecords.
+
+  This is a module level function so that it can be used by a process pool.
+  Errors are returned rather than logged, since log records emitted by a
+  worker process can be lost.
+
+  Args:
+    leveldb_records: the leveldb records.
+    parse_value_for: if set, only the values of keys with one of these key
+        classes are parsed.
+    include_traceback: True to include the formatted traceback in the parse
+        errors.
+  """
+  return [
+      _TryParseLevelDBRecord(
+          leveldb_record,
+          parse_value_for=parse_value_for,
+          include_traceback=include_traceback)
+      for leveldb_record in leveldb_records]
+
+
+def _CheckParseResult(
+    result: Union[IndexedDBRecord, _RecordParseError]
+) -> Optional[IndexedDBRecord]:
+  """Returns the IndexedDBRecord of a parse result or logs the parse error.
+
+  Args:
+    result: the IndexedDBRecord or the parse error.
+
+  Returns:
+    the IndexedDBRecord or None if parsing failed.
+  """
+  if isinstance(result, _RecordParseError):
+    logging.warning(
+        'Error parsing Indexeddb record: %s at offset %d in %s',
+        result.error, result.offset, result.path)
+    if result.traceback:
+      logging.debug('Traceback:\n%s', result.traceback)
+    return None
+  return result
+
+
+def _ParseLevelDBRecord(
+    leveldb_record: record.LevelDBRecord,
+    parse_value_for: Optional[Set[Type[BaseIndexedDBKey]]] = None
+) -> Optional[IndexedDBRecord]:
+  """Returns an IndexedDBRecord from a LevelDBRecord or None on error.
+
+  Args:
+    leveldb_record: the leveldb record.
+    parse_value_for: if set, only the values of keys with one of these key
+        classes are parsed.
+  """
+  try:
+    return IndexedDBRecord.FromLevelDBRecord(
+        leveldb_record, parse_value_for=parse_value_for)
+  except(
+      errors.ParserError,
+      errors.DecoderError,
+      NotImplementedError) as err:
+    logging.warning(
+        'Error parsing Indexeddb record: %s at offset %d in %s',
+        err, leveldb_record.record.offset, leveldb_record.path)
+    logging.debug('Traceback:', exc_info=True)
+  return None
+
+
+def _ChunkLevelDBRecords(
+    leveldb_records: Iterable[record.LevelDBRecord],
+    chunk_size: int
+) -> Generator[List[record.LevelDBRecord], None, None]:
+  """Yields lists of at most chunk_size LevelDBRecords.
+
+  Args:
+    leveldb_records: the leveldb records.
+    chunk_size: the maximum number of records in a chunk.
+  """
+  leveldb_records = iter(leveldb_records)
+  chunk = list(itertools.islice(leveldb_records, chunk_size))
+  while chunk:
+    yield chunk
+    chunk = list(itertools.islice(leveldb_records, chunk_size))
 
 
 class FolderReader:
@@ -1508,7 +1686,9 @@ class FolderReader:
   def GetRecords(
       self,
       use_manifest: bool = False,
-      use_sequence_number: bool = False
+      use_sequence_number: bool = False,
+      parse_value_for: Optional[Set[Type[BaseIndexedDBKey]]] = None,
+      workers: Optional[int] = None
   ) -> Generator[IndexedDBRecord, None, None]:
     """Yield LevelDBRecords.
 
@@ -1516,22 +1696,79 @@ class FolderReader:
       use_manifest: True to use the current manifest in the folder as a means to
           find the active file set.
       use_sequence_number: True to use the sequence number to determine the
+          active/deleted records.
+      parse_value_for: if set, only the values of keys with one of these key
+          classes are parsed.
+      workers: if set and greater than 1, the number of worker processes used
+          to parse the IndexedDB keys and values.  Records are yielded in the
+          same order as when parsed serially.
+
     Yields:
       IndexedDBRecord.
     """
     leveldb_folder_reader = record.FolderReader(self.folder_name)
-    for leveldb_record in leveldb_folder_reader.GetRecords(
+    leveldb_records = leveldb_folder_reader.GetRecords(
         use_manifest=use_manifest,
-        use_sequence_number=use_sequence_number):
-      try:
-        yield IndexedDBRecord.FromLevelDBRecord(leveldb_record)
-      except(
-          errors.ParserError,
-          errors.DecoderError,
-          NotImplementedError) as err:
-        print((
-            'Error parsing Indexeddb record: '
-            f'{err} at offset {leveldb_record.record.offset} in '
-            f'{leveldb_record.path}'),
-            file=sys.stderr)
-        print(f'Traceback: {traceback.format_exc()}', file=sys.stderr)
+        use_sequence_number=use_sequence_number)
+
+    if workers and workers > 1:
+      yield from self._ParseWithWorkers(
+          leveldb_records, parse_value_for, workers)
+      return
+
+    for leveldb_record in leveldb_records:
+      idb_record = _ParseLevelDBRecord(
+          leveldb_record, parse_value_for=parse_value_for)
+      if idb_record is not None:
+        yield idb_record
+
+  def _ParseWithWorkers(
+      self,
+      leveldb_records: Iterable[record.LevelDBRecord],
+      parse_value_for: Optional[Set[Type[BaseIndexedDBKey]]],
+      workers: int
+  ) -> Generator[IndexedDBRecord, None, None]:
+    """Yields IndexedDBRecords parsed by a pool of worker processes.
+
+    At most _WORKER_CHUNKS_PER_WORKER chunks per worker are in flight, so the
+    LevelDB records are read as the parsed records are consumed.  Chunks that
+    have not started are cancelled when the generator is closed early.
+
+    Args:
+      leveldb_records: the leveldb records.
+      parse_value_for: if set, only the values of keys with one of these key
+          classes are parsed.
+      workers: the number of worker processes.
+
+    Yields:
+      IndexedDBRecord.
+    """
+    chunks = _ChunkLevelDBRecords(leveldb_records, _WORKER_CHUNK_SIZE)
+    include_traceback = logging.getLogger().isEnabledFor(logging.DEBUG)
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+    try:
+      for chunk in itertools.islice(
+          chunks, _WORKER_CHUNKS_PER_WORKER * workers):
+        pending.append(executor.submit(
+            _TryParseLevelDBRecords, chunk, parse_value_for,
+            include_traceback))
+
+      while pending:
+        results = pending.popleft().result()
+        chunk = next(chunks, None)
+        if chunk:
+          pending.append(executor.submit(
+              _TryParseLevelDBRecords, chunk, parse_value_for,
+              include_traceback))
+        for result in results:
+          idb_record = _CheckParseResult(result)
+          if idb_record is not None:
+            yield idb_record
+    finally:
+      if sys.version_info >= (3, 9):
+        executor.shutdown(cancel_futures=True)
+      else:
+        for future in pending:
+          future.cancel()
+        executor.shutdown()
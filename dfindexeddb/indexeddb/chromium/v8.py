@@ -16,9 +16,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+import functools
 import io
 import os
+import sys
 from typing import Any, BinaryIO, Dict, Optional, Set, Tuple, Union
 
 from dfindexeddb import errors
@@ -27,6 +29,23 @@ from dfindexeddb.indexeddb import types
 from dfindexeddb.indexeddb.chromium import definitions
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+# The serialization tags by their raw value, which are faster to look up than
+# calling the enum.
+_SERIALIZATION_TAGS = {
+    member.value: member for member in definitions.V8SerializationTag}
+
+# The text encodings of the serialized string tags.
+_STRING_TAG_ENCODINGS = {
+    definitions.V8SerializationTag.ONE_BYTE_STRING: 'latin-1',
+    definitions.V8SerializationTag.TWO_BYTE_STRING: 'utf-16-le',
+    definitions.V8SerializationTag.UTF8_STRING: 'utf-8'}
+
+# The maximum byte length and number of cached object property keys.
+_MAXIMUM_KEY_CACHE_BYTES = 64
+_MAXIMUM_KEY_CACHE_SIZE = 512
+
 @dataclass
 class ArrayBufferView:
   """A parsed Javascript ArrayBufferView."""
@@ -48,6 +67,8 @@ class ValueDeserializer:
     objects (dict[int, Any]): a dictionary mapping integer IDs to a
       deserialized object.
     version (int): the version of the serialized Javascript value/object
+    key_cache (dict[tuple[V8SerializationTag, bytes], str]): the decoded
+      object property keys by their tag and raw bytes.
   """
 
   LATEST_VERSION = 15
@@ -65,6 +86,7 @@ class ValueDeserializer:
     self.next_id = 0
     self.objects = {}
     self.version = None
+    self.key_cache = {}
 
   def GetWireFormatVersion(self) -> int:
     """Returns the underlying wire format version.
@@ -113,12 +135,12 @@ class ValueDeserializer:
       _, tag_value = self.decoder.PeekBytes(1)
     except errors.DecoderError:
       return None
-    try:
-      return definitions.V8SerializationTag(tag_value[0])
-    except ValueError as error:
+    tag = _SERIALIZATION_TAGS.get(tag_value[0])
+    if tag is None:
       raise errors.ParserError(
           f'Invalid v8 tag value {tag_value} at offset'
-          f' {self.decoder.stream.tell()}') from error
+          f' {self.decoder.stream.tell()}')
+    return tag
 
   def _ReadTag(self) -> definitions.V8SerializationTag:
     """Returns the next non-padding serialization tag.
@@ -128,10 +150,9 @@ class ValueDeserializer:
     """
     while True:
       _, tag_value = self.decoder.ReadBytes(1)
-      try:
-        tag = definitions.V8SerializationTag(tag_value[0])
-      except ValueError as error:
-        raise errors.ParserError(f'Invalid v8 tag value {tag_value}') from error
+      tag = _SERIALIZATION_TAGS.get(tag_value[0])
+      if tag is None:
+        raise errors.ParserError(f'Invalid v8 tag value {tag_value}')
       if tag != definitions.V8SerializationTag.PADDING:
         return tag
 
@@ -151,6 +172,10 @@ class ValueDeserializer:
   def _ReadObject(self):
     """Reads a Javascript object from the current position."""
     _, result = self._ReadObjectInternal()
+    # as in V8, only an array buffer (including a reference to one) can be
+    # followed by an array buffer view, so other objects skip the peek.
+    if not isinstance(result, bytes):
+      return result
     tag = self._PeekTag()
     if tag and tag == definitions.V8SerializationTag.ARRAY_BUFFER_VIEW:
       self._ConsumeTag(tag)
@@ -165,72 +190,12 @@ class ValueDeserializer:
       a tuple of the serialization tag and the parsed object.
     """
     tag = self._ReadTag()
-    if tag == definitions.V8SerializationTag.VERIFY_OBJECT_COUNT:
+    reader = self.TAG_TO_READER.get(tag)
+    if reader:
+      parsed_object = reader(self)
+    elif tag == definitions.V8SerializationTag.VERIFY_OBJECT_COUNT:
       _ = self.decoder.DecodeUint32Varint()
       parsed_object = self._ReadObject()
-    elif tag == definitions.V8SerializationTag.UNDEFINED:
-      parsed_object = types.Undefined()
-    elif tag == definitions.V8SerializationTag.NULL:
-      parsed_object = types.Null()
-    elif tag == definitions.V8SerializationTag.TRUE:
-      parsed_object = True
-    elif tag == definitions.V8SerializationTag.FALSE:
-      parsed_object = False
-    elif tag == definitions.V8SerializationTag.INT32:
-      _, parsed_object = self.decoder.DecodeInt32Varint()
-    elif tag == definitions.V8SerializationTag.UINT32:
-      _, parsed_object = self.decoder.DecodeUint32Varint()
-    elif tag == definitions.V8SerializationTag.DOUBLE:
-      _, parsed_object = self.decoder.DecodeDouble()
-    elif tag == definitions.V8SerializationTag.BIGINT:
-      parsed_object = self.ReadBigInt()
-    elif tag == definitions.V8SerializationTag.UTF8_STRING:
-      parsed_object = self.ReadUTF8String()
-    elif tag == definitions.V8SerializationTag.ONE_BYTE_STRING:
-      parsed_object = self.ReadOneByteString()
-    elif tag == definitions.V8SerializationTag.TWO_BYTE_STRING:
-      parsed_object = self.ReadTwoByteString()
-    elif tag == definitions.V8SerializationTag.OBJECT_REFERENCE:
-      _, object_id = self.decoder.DecodeUint32Varint()
-      parsed_object = self.objects[object_id]
-    elif tag == definitions.V8SerializationTag.BEGIN_JS_OBJECT:
-      parsed_object = self._ReadJSObject()
-    elif tag == definitions.V8SerializationTag.BEGIN_SPARSE_JS_ARRAY:
-      parsed_object = self.ReadSparseJSArray()
-    elif tag == definitions.V8SerializationTag.BEGIN_DENSE_JS_ARRAY:
-      parsed_object = self.ReadDenseJSArray()
-    elif tag == definitions.V8SerializationTag.DATE:
-      parsed_object = self._ReadJSDate()
-    elif tag in (
-        definitions.V8SerializationTag.TRUE_OBJECT,
-        definitions.V8SerializationTag.FALSE_OBJECT,
-        definitions.V8SerializationTag.NUMBER_OBJECT,
-        definitions.V8SerializationTag.BIGINT_OBJECT,
-        definitions.V8SerializationTag.STRING_OBJECT):
-      parsed_object = self._ReadJSPrimitiveWrapper(tag)
-    elif tag == definitions.V8SerializationTag.REGEXP:
-      parsed_object = self._ReadJSRegExp()
-    elif tag == definitions.V8SerializationTag.BEGIN_JS_MAP:
-      parsed_object = self._ReadJSMap()
-    elif tag == definitions.V8SerializationTag.BEGIN_JS_SET:
-      parsed_object = self._ReadJSSet()
-    elif tag == definitions.V8SerializationTag.ARRAY_BUFFER:
-      parsed_object = self._ReadJSArrayBuffer(
-          is_shared=False, is_resizable=False)
-    elif tag == definitions.V8SerializationTag.RESIZABLE_ARRAY_BUFFER:
-      parsed_object = self._ReadJSArrayBuffer(
-          is_shared=False, is_resizable=True)
-    elif tag == definitions.V8SerializationTag.SHARED_ARRAY_BUFFER:
-      parsed_object = self._ReadJSArrayBuffer(
-          is_shared=True, is_resizable=False)
-    elif tag == definitions.V8SerializationTag.ERROR:
-      parsed_object = self._ReadJSError()
-    elif tag == definitions.V8SerializationTag.WASM_MODULE_TRANSFER:
-      parsed_object = self._ReadWasmModuleTransfer()
-    elif tag == definitions.V8SerializationTag.WASM_MEMORY_TRANSFER:
-      parsed_object = self._ReadWasmMemory()
-    elif tag == definitions.V8SerializationTag.HOST_OBJECT:
-      parsed_object = self.ReadHostObject()
     elif (
         tag == definitions.V8SerializationTag.SHARED_OBJECT and
             self.version >= 15):
@@ -258,15 +223,16 @@ class ValueDeserializer:
 
   def ReadBigInt(self) -> int:
     """Reads a Javascript Bigint from the current position."""
-    bit_field = self.decoder.DecodeUint32Varint()[1]
+    bit_field = self.decoder.DecodeUint32VarintValue()
     byte_count = bit_field >> 1
     signed = bool(bit_field & 0x1)
-    _, bigint = self.decoder.DecodeInt(byte_count=byte_count)
+    # the digits are the unsigned magnitude, the sign is in the bit field.
+    bigint = self.decoder.DecodeIntValue(byte_count=byte_count, signed=False)
     return -bigint if signed else bigint
 
   def ReadUTF8String(self) -> str:
     """Reads a UTF-8 string from the current position."""
-    count = self.decoder.DecodeUint32Varint()[1]
+    count = self.decoder.DecodeUint32VarintValue()
     buffer = self.decoder.ReadBytes(count=count)[1]
     return buffer.decode('utf-8')
 
@@ -275,13 +241,13 @@ class ValueDeserializer:
 
     The raw bytes are decoded using latin-1 encoding.
     """
-    length = self.decoder.DecodeUint32Varint()[1]
+    length = self.decoder.DecodeUint32VarintValue()
     buffer = self.decoder.ReadBytes(count=length)[1]
     return buffer.decode('latin-1')
 
   def ReadTwoByteString(self) -> str:
     """Reads a UTF-16-LE string from the current position."""
-    length = self.decoder.DecodeUint32Varint()[1]
+    length = self.decoder.DecodeUint32VarintValue()
     buffer = self.decoder.ReadBytes(count=length)[1]
     return buffer.decode('utf-16-le')
 
@@ -296,7 +262,7 @@ class ValueDeserializer:
     tag = self._ReadTag()
     if not tag:
       return None
-    _, byte_length = self.decoder.DecodeUint32Varint()
+    byte_length = self.decoder.DecodeUint32VarintValue()
     if not byte_length:
       return None
 
@@ -322,7 +288,7 @@ class ValueDeserializer:
 
     num_properties = self._ReadJSObjectProperties(
         js_object, definitions.V8SerializationTag.END_JS_OBJECT)
-    _, expected_number_properties = self.decoder.DecodeUint32Varint()
+    expected_number_properties = self.decoder.DecodeUint32VarintValue()
     if expected_number_properties != num_properties:
       raise errors.ParserError('Unexpected number of properties')
 
@@ -345,16 +311,41 @@ class ValueDeserializer:
     """
     num_properties = 0
     while self._PeekTag() != end_tag:
-      key = self._ReadObject()
+      key = self._ReadPropertyKey()
       value = self._ReadObject()
       if isinstance(js_object, dict):
         js_object[key] = value
       else:
         js_object.properties[key] = value
       num_properties += 1
-    self._ConsumeTag(end_tag)
+    # the peeked end tag is the next byte.
+    self.decoder.ReadBytes(1)
     return num_properties
 
+  def _ReadPropertyKey(self) -> Any:
+    """Reads an object property key from the current position.
+
+    Objects of the same shape repeat the same string keys, so short string
+    keys are decoded once and the interned string is reused.
+    """
+    tag = self._PeekTag()
+    encoding = _STRING_TAG_ENCODINGS.get(tag)
+    if not encoding:
+      return self._ReadObject()
+
+    self._ConsumeTag(tag)
+    length = self.decoder.DecodeUint32VarintValue()
+    _, raw_bytes = self.decoder.ReadBytes(count=length)
+    if length > _MAXIMUM_KEY_CACHE_BYTES:
+      return raw_bytes.decode(encoding)
+
+    key = self.key_cache.get((tag, raw_bytes))
+    if key is None:
+      key = sys.intern(raw_bytes.decode(encoding))
+      if len(self.key_cache) < _MAXIMUM_KEY_CACHE_SIZE:
+        self.key_cache[(tag, raw_bytes)] = key
+    return key
+
   def _GetNextId(self) -> int:
     """Gets the next object ID."""
     next_id = self.next_id
@@ -370,14 +361,13 @@ class ValueDeserializer:
     next_id = self._GetNextId()
 
     js_array = types.JSArray()
-    _, length = self.decoder.DecodeUint32Varint()
-    for _ in range(length):
-      js_array.values.append(types.Undefined())
+    length = self.decoder.DecodeUint32VarintValue()
+    js_array.values = [types.Undefined() for _ in range(length)]
 
     num_properties = self._ReadJSObjectProperties(
         js_array.properties, definitions.V8SerializationTag.END_SPARSE_JS_ARRAY)
-    _, expected_num_properties = self.decoder.DecodeUint32Varint()
-    _, expected_length = self.decoder.DecodeUint32Varint()
+    expected_num_properties = self.decoder.DecodeUint32VarintValue()
+    expected_length = self.decoder.DecodeUint32VarintValue()
 
     if num_properties != expected_num_properties:
       raise errors.ParserError('Unexpected property length')
@@ -395,22 +385,33 @@ class ValueDeserializer:
     next_id = self._GetNextId()
 
     js_array = types.JSArray()
-    _, length = self.decoder.DecodeUint32Varint()
+    length = self.decoder.DecodeUint32VarintValue()
+    # each array element is at least one byte so the remaining bytes bound
+    # the length before pre-allocating the values.
+    if length > self.decoder.NumRemainingBytes():
+      raise errors.ParserError('Unexpected array length')
+    values = [None] * length
+    num_values = 0
+    # versions before 11 serialize holes as undefined values.
+    skip_undefined = self.version < 11
     for _ in range(length):
-      tag = self._PeekTag()
-      if tag == definitions.V8SerializationTag.THE_HOLE:
-        self._ConsumeTag(tag)
+      if self._PeekTag() == definitions.V8SerializationTag.THE_HOLE:
+        # the peeked hole tag is the next byte.
+        self.decoder.ReadBytes(1)
         continue
       array_object = self._ReadObject()
 
-      if self.version < 11 and isinstance(array_object, types.Undefined):
+      if skip_undefined and isinstance(array_object, types.Undefined):
         continue
-      js_array.values.append(array_object)
+      values[num_values] = array_object
+      num_values += 1
+    del values[num_values:]
+    js_array.values = values
 
     num_properties = self._ReadJSObjectProperties(
         js_array.properties, definitions.V8SerializationTag.END_DENSE_JS_ARRAY)
-    _, expected_num_properties = self.decoder.DecodeUint32Varint()
-    _, expected_length = self.decoder.DecodeUint32Varint()
+    expected_num_properties = self.decoder.DecodeUint32VarintValue()
+    expected_length = self.decoder.DecodeUint32VarintValue()
     if num_properties != expected_num_properties:
       raise errors.ParserError('Unexpected property length')
     if length != expected_length:
@@ -423,7 +424,7 @@ class ValueDeserializer:
     next_id = self._GetNextId()
 
     _, value = self.decoder.DecodeDouble()
-    result = datetime.utcfromtimestamp(value/1000.0)
+    result = _EPOCH + timedelta(milliseconds=value)
     self.objects[next_id] = result
     return result
 
@@ -465,7 +466,7 @@ class ValueDeserializer:
     """Reads a Javascript regular expression from the current position."""
     next_id = self._GetNextId()
     pattern = self.ReadString()
-    _, flags = self.decoder.DecodeUint32Varint()  # TODO: verify flags
+    flags = self.decoder.DecodeUint32VarintValue()  # TODO: verify flags
     regexp = types.RegExp(pattern=pattern, flags=str(flags))
     self.objects[next_id] = regexp
     return regexp
@@ -485,9 +486,10 @@ class ValueDeserializer:
       value = self._ReadObject()
       js_map[key] = value
       tag = self._PeekTag()
-    self._ConsumeTag(definitions.V8SerializationTag.END_JS_MAP)
+    # the peeked end tag is the next byte.
+    self.decoder.ReadBytes(1)
 
-    _, expected_length = self.decoder.DecodeUint32Varint()
+    expected_length = self.decoder.DecodeUint32VarintValue()
     if len(js_map) * 2 != expected_length:
       raise errors.ParserError('unexpected length')
 
@@ -508,9 +510,10 @@ class ValueDeserializer:
       element = self._ReadObject()
       js_set.add(element)
       tag = self._PeekTag()
-    self._ConsumeTag(definitions.V8SerializationTag.END_JS_SET)
+    # the peeked end tag is the next byte.
+    self.decoder.ReadBytes(1)
 
-    _, expected_length = self.decoder.DecodeUint32Varint()
+    expected_length = self.decoder.DecodeUint32VarintValue()
     if len(js_set) != expected_length:
       raise ValueError('unexpected length')
 
@@ -534,10 +537,10 @@ class ValueDeserializer:
     if is_shared:
       raise NotImplementedError('Shared ArrayBuffer not supported yet')
 
-    _, byte_length = self.decoder.DecodeUint32Varint()
+    byte_length = self.decoder.DecodeUint32VarintValue()
     max_byte_length = byte_length
     if is_resizable:
-      _, max_byte_length = self.decoder.DecodeUint32Varint()
+      max_byte_length = self.decoder.DecodeUint32VarintValue()
       if byte_length > max_byte_length:
         self.objects[next_id] = array_buffer
         return array_buffer
@@ -550,11 +553,11 @@ class ValueDeserializer:
   def _ReadJSArrayBufferView(self, buffer):
     """Reads a JSArrayBufferView from the current position."""
     _, tag = self.decoder.ReadBytes(1)
-    _, byte_offset = self.decoder.DecodeUint32Varint()
-    _, byte_length = self.decoder.DecodeUint32Varint()
+    byte_offset = self.decoder.DecodeUint32VarintValue()
+    byte_length = self.decoder.DecodeUint32VarintValue()
 
     if self.version >= 14:  # or version_13_broken_data_mode
-      _, flags = self.decoder.DecodeUint32Varint()
+      flags = self.decoder.DecodeUint32VarintValue()
     else:
       flags = 0
 
@@ -595,6 +598,62 @@ class ValueDeserializer:
     self.objects[next_id] = host_object
     return host_object
 
+  # the readers for the serialization tags, other than the tags that depend on
+  # the wire format version.
+  TAG_TO_READER = {
+      definitions.V8SerializationTag.UNDEFINED: (
+          lambda deserializer: types.Undefined()),
+      definitions.V8SerializationTag.NULL: lambda deserializer: types.Null(),
+      definitions.V8SerializationTag.TRUE: lambda deserializer: True,
+      definitions.V8SerializationTag.FALSE: lambda deserializer: False,
+      definitions.V8SerializationTag.INT32: (
+          lambda deserializer: deserializer.decoder.DecodeInt32Varint()[1]),
+      definitions.V8SerializationTag.UINT32: (
+          lambda deserializer: deserializer.decoder.DecodeUint32VarintValue()),
+      definitions.V8SerializationTag.DOUBLE: (
+          lambda deserializer: deserializer.decoder.DecodeDouble()[1]),
+      definitions.V8SerializationTag.BIGINT: ReadBigInt,
+      definitions.V8SerializationTag.UTF8_STRING: ReadUTF8String,
+      definitions.V8SerializationTag.ONE_BYTE_STRING: ReadOneByteString,
+      definitions.V8SerializationTag.TWO_BYTE_STRING: ReadTwoByteString,
+      definitions.V8SerializationTag.OBJECT_REFERENCE: (
+          lambda deserializer: deserializer.objects[
+              deserializer.decoder.DecodeUint32VarintValue()]),
+      definitions.V8SerializationTag.BEGIN_JS_OBJECT: _ReadJSObject,
+      definitions.V8SerializationTag.BEGIN_SPARSE_JS_ARRAY: ReadSparseJSArray,
+      definitions.V8SerializationTag.BEGIN_DENSE_JS_ARRAY: ReadDenseJSArray,
+      definitions.V8SerializationTag.DATE: _ReadJSDate,
+      definitions.V8SerializationTag.TRUE_OBJECT: functools.partial(
+          _ReadJSPrimitiveWrapper,
+          tag=definitions.V8SerializationTag.TRUE_OBJECT),
+      definitions.V8SerializationTag.FALSE_OBJECT: functools.partial(
+          _ReadJSPrimitiveWrapper,
+          tag=definitions.V8SerializationTag.FALSE_OBJECT),
+      definitions.V8SerializationTag.NUMBER_OBJECT: functools.partial(
+          _ReadJSPrimitiveWrapper,
+          tag=definitions.V8SerializationTag.NUMBER_OBJECT),
+      definitions.V8SerializationTag.BIGINT_OBJECT: functools.partial(
+          _ReadJSPrimitiveWrapper,
+          tag=definitions.V8SerializationTag.BIGINT_OBJECT),
+      definitions.V8SerializationTag.STRING_OBJECT: functools.partial(
+          _ReadJSPrimitiveWrapper,
+          tag=definitions.V8SerializationTag.STRING_OBJECT),
+      definitions.V8SerializationTag.REGEXP: _ReadJSRegExp,
+      definitions.V8SerializationTag.BEGIN_JS_MAP: _ReadJSMap,
+      definitions.V8SerializationTag.BEGIN_JS_SET: _ReadJSSet,
+      definitions.V8SerializationTag.ARRAY_BUFFER: functools.partial(
+          _ReadJSArrayBuffer, is_shared=False, is_resizable=False),
+      definitions.V8SerializationTag.RESIZABLE_ARRAY_BUFFER: functools.partial(
+          _ReadJSArrayBuffer, is_shared=False, is_resizable=True),
+      definitions.V8SerializationTag.SHARED_ARRAY_BUFFER: functools.partial(
+          _ReadJSArrayBuffer, is_shared=True, is_resizable=False),
+      definitions.V8SerializationTag.ERROR: _ReadJSError,
+      definitions.V8SerializationTag.WASM_MODULE_TRANSFER: (
+          _ReadWasmModuleTransfer),
+      definitions.V8SerializationTag.WASM_MEMORY_TRANSFER: _ReadWasmMemory,
+      definitions.V8SerializationTag.HOST_OBJECT: ReadHostObject,
+  }
+
   @classmethod
   def FromBytes(cls, data: bytes, delegate: Any) -> Any:
     """Returns a deserialized javascript object from the data.
@@ -18,6 +18,7 @@ from __future__ import annotations
 import dataclasses
 import datetime
 import io
+import os
 import struct
 from typing import Any, List, Tuple, Union
 
@@ -136,15 +137,13 @@ class KeyDecoder(utils.StreamDecoder):
 
   def _ReadUntilNull(self) -> bytearray:
     """Read bytes until a null (terminator) byte is encountered."""
-    result = bytearray()
-    num_remaining_bytes = self.NumRemainingBytes()
-    while num_remaining_bytes:
-      _, c = self.ReadBytes(1)
-      if c == b'\x00':
-        break
-      result += c
-      num_remaining_bytes -= 1
-    return result
+    offset = self.stream.tell()
+    buffer = self.stream.read(self.NumRemainingBytes())
+    null_index = buffer.find(b'\x00')
+    if null_index == -1:
+      return bytearray(buffer)
+    self.stream.seek(offset + null_index + 1, os.SEEK_SET)
+    return bytearray(buffer[:null_index])
 
   def _DecodeAsStringy(self, element_size: int = 1) -> Tuple[int, bytes]:
     """Decodes a string buffer.
@@ -18,8 +18,8 @@ import dataclasses
 from datetime import datetime
 import json
 import pathlib
+import sys
 
-from dfindexeddb import utils
 from dfindexeddb import version
 from dfindexeddb.leveldb import descriptor
 from dfindexeddb.leveldb import ldb
@@ -32,6 +32,12 @@ _VALID_PRINTABLE_CHARACTERS = (
     ' abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789' +
     '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~.')
 
+# The escaped form of each byte that is not a valid printable character, keyed
+# by the byte value for str.translate.
+_BYTE_ESCAPES = {
+    byte: f'\\x{byte:02X}' for byte in range(256)
+    if chr(byte) not in _VALID_PRINTABLE_CHARACTERS}
+
 
 class Encoder(json.JSONEncoder):
   """A JSON encoder class for dfleveldb fields."""
@@ -39,16 +45,15 @@ class Encoder(json.JSONEncoder):
   def default(self, o):
     """Returns a serializable object for o."""
     if dataclasses.is_dataclass(o):
-      o_dict = utils.asdict(o)
+      # only the top level is converted, the json module calls default again
+      # for any nested values it cannot encode.
+      o_dict = {'__type__': o.__class__.__name__}
+      for field in dataclasses.fields(o):
+        o_dict[field.name] = getattr(o, field.name)
       return o_dict
     if isinstance(o, bytes):
-      out = []
-      for x in o:
-        if chr(x) not in _VALID_PRINTABLE_CHARACTERS:
-          out.append(f'\\x{x:02X}')
-        else:
-          out.append(chr(x))
-      return ''.join(out)
+      # latin-1 maps each byte to the character with the same value.
+      return o.decode('latin-1').translate(_BYTE_ESCAPES)
     if isinstance(o, datetime):
       return o.isoformat()
     if isinstance(o, set):
@@ -59,7 +64,10 @@ class Encoder(json.JSONEncoder):
 def _Output(structure, output):
   """Helper method to output parsed structure to stdout."""
   if output == 'json':
-    print(json.dumps(structure, indent=2, cls=Encoder))
+    # indented output is not built by the C encoder, so it is written to
+    # stdout as it is encoded rather than joined into one string first.
+    json.dump(structure, sys.stdout, indent=2, cls=Encoder)
+    print()
   elif output == 'jsonl':
     print(json.dumps(structure, cls=Encoder))
   elif output == 'repr':
@@ -361,10 +361,10 @@ class FileReader:
         buffer = bytearray(physical_record.contents)
       elif (physical_record.record_type ==
             definitions.LogFilePhysicalRecordType.MIDDLE):
-        buffer.extend(bytearray(physical_record.contents))
+        buffer.extend(physical_record.contents)
       elif (physical_record.record_type ==
             definitions.LogFilePhysicalRecordType.LAST):
-        buffer.extend(bytearray(physical_record.contents))
+        buffer.extend(physical_record.contents)
         version_edit = VersionEdit.FromBytes(buffer, base_offset=offset)
         yield version_edit
         buffer = bytearray()
@@ -27,6 +27,11 @@ from dfindexeddb.leveldb import definitions
 from dfindexeddb.leveldb import utils
 
 
+_BLOCK_DECOMPRESSORS = {
+    definitions.BlockCompressionType.SNAPPY: snappy.decompress,
+    definitions.BlockCompressionType.ZSTD: zstd.decompress}
+
+
 @dataclass
 class KeyValueRecord:
   """A leveldb table key-value record.
@@ -105,10 +110,9 @@ class Block:
 
   def GetBuffer(self) -> bytes:
     """Returns the block buffer, decompressing if required."""
-    if self.IsSnappyCompressed():
-      return snappy.decompress(self.data)
-    if self.IsZstdCompressed():
-      return zstd.decompress(self.data)
+    decompress = _BLOCK_DECOMPRESSORS.get(self.footer[0])
+    if decompress:
+      return decompress(self.data)
     return self.data
 
   def GetRecords(self) -> Iterable[KeyValueRecord]:
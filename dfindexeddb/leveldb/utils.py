@@ -14,7 +14,6 @@
 # limitations under the License.
 """Helper/utility classes for LevelDB."""
 from __future__ import annotations
-import io
 from typing import BinaryIO, Tuple, Type, TypeVar
 
 from dfindexeddb import errors
@@ -27,11 +26,33 @@ class LevelDBDecoder(utils.StreamDecoder):
   def DecodeBool(self) -> Tuple[int, bool]:
     """Returns a Tuple of the offset of decoding and the bool value."""
     offset, buffer = self.ReadBytes(1)
-    return offset, buffer[0] is not None
+    return offset, buffer[0] != 0
+
+  def DecodeBoolValue(self) -> bool:
+    """Returns the bool value without the offset.
+
+    Raises:
+      errors.DecoderError: if there are no bytes to read.
+    """
+    buffer = self.stream.read(1)
+    if not buffer:
+      raise errors.DecoderError(
+          f'No bytes available at offset {self.stream.tell()}')
+    return buffer != b'\x00'
 
   def DecodeString(self) -> Tuple[int, str]:
     """Returns a tuple of the offset of decoding and the string value.
 
+    Raises:
+      errors.DecoderError: when the parsed string buffer is not even (i.e.
+          cannot be decoded as a UTF-16-BE string.
+    """
+    offset = self.stream.tell()
+    return offset, self.DecodeStringValue()
+
+  def DecodeStringValue(self) -> str:
+    """Returns the string value without the offset.
+
     Raises:
       errors.DecoderError: when the parsed string buffer is not even (i.e.
           cannot be decoded as a UTF-16-BE string.
@@ -41,7 +62,7 @@ class LevelDBDecoder(utils.StreamDecoder):
     if len(buffer) % 2:
       raise errors.DecoderError(
           f'Odd number of bytes encountered at offset {offset}')
-    return offset, buffer.decode('utf-16-be')
+    return buffer.decode('utf-16-be')
 
   def DecodeLengthPrefixedSlice(self) -> Tuple[int, bytes]:
     """Returns a tuple of the offset of decoding and the byte 'slice'."""
@@ -112,5 +133,5 @@ class FromDecoderMixin:
     Returns:
       The class instance.
     """
-    stream = io.BytesIO(raw_data)
-    return cls.FromStream(stream=stream, base_offset=base_offset)
+    decoder = LevelDBDecoder.FromBytes(raw_data)
+    return cls.FromDecoder(decoder=decoder, base_offset=base_offset)
@@ -19,12 +19,20 @@ import dataclasses
 import io
 import os
 import struct
-from typing import BinaryIO, Tuple, Type, TypeVar
+from typing import BinaryIO, Optional, Tuple, Type, TypeVar
 
 
 from dfindexeddb import errors
 
 
+_DOUBLE_BE = struct.Struct('>d')
+_DOUBLE_LE = struct.Struct('<d')
+_FLOAT_BE = struct.Struct('>f')
+_FLOAT_LE = struct.Struct('<f')
+
+T = TypeVar('T')
+
+
 class StreamDecoder:
   """A helper class to decode primitive data types from BinaryIO streams.
 
@@ -32,13 +40,30 @@ class StreamDecoder:
     stream (BinaryIO): the binary stream.
   """
 
-  def __init__(self, stream: BinaryIO):
+  def __init__(self, stream: BinaryIO, end_offset: Optional[int] = None):
     """Initializes a StreamDecoder instance.
 
+    The stream is not expected to change size while it is being decoded.
+
     Args:
       stream: the binary stream.
+      end_offset: the end offset of the stream, if known.
     """
     self.stream = stream
+    if end_offset is None:
+      current_offset = stream.tell()
+      end_offset = stream.seek(0, os.SEEK_END)
+      stream.seek(current_offset, os.SEEK_SET)
+    self._end_offset = end_offset
+
+  @classmethod
+  def FromBytes(cls: Type[T], raw_data: bytes) -> T:
+    """Returns a decoder for raw bytes.
+
+    Args:
+      raw_data: the raw data.
+    """
+    return cls(io.BytesIO(raw_data), end_offset=len(raw_data))
 
   def NumRemainingBytes(self) -> int:
     """Returns the number of bytes available to the decoder.
@@ -46,10 +71,7 @@ class StreamDecoder:
     Raises:
       errors.DecoderError: if there are a negative number of remaining bytes.
     """
-    current_offset = self.stream.tell()
-    end_offset = self.stream.seek(0, os.SEEK_END)
-    self.stream.seek(current_offset, os.SEEK_SET)
-    num_rem_bytes = end_offset - current_offset
+    num_rem_bytes = self._end_offset - self.stream.tell()
     if num_rem_bytes < 0:
       raise errors.DecoderError('Negative number of remaining bytes.')
     return num_rem_bytes
@@ -110,9 +132,29 @@ class StreamDecoder:
     offset, buffer = self.ReadBytes(byte_count)
     return offset, int.from_bytes(buffer, byteorder=byte_order, signed=signed)
 
+  def DecodeIntValue(
+      self,
+      byte_count: int = -1,
+      byte_order: str = 'little',
+      signed: bool = True
+  ) -> int:
+    """Decodes an integer from the binary stream without the offset.
+
+    Args:
+      byte_count: the number of bytes to read.
+      byte_order: the endianness of the integer.
+      signed: True if twos-complement is used to represent the integer.
+
+    Returns:
+      the decoded integer.
+    """
+    _, buffer = self.ReadBytes(byte_count)
+    return int.from_bytes(buffer, byteorder=byte_order, signed=signed)
+
   def DecodeUint8(self) -> Tuple[int, int]:
     """Decodes an unsigned 8-bit integer from the binary stream."""
-    return self.DecodeInt(byte_count=1, signed=False)
+    offset, buffer = self.ReadBytes(1)
+    return offset, buffer[0]
 
   def DecodeUint16(self) -> Tuple[int, int]:
     """Decodes an unsigned 16-bit integer from the binary stream."""
@@ -162,30 +204,50 @@ class StreamDecoder:
     """Returns a Tuple of the offset and a double-precision float."""
     offset, blob = self.ReadBytes(8)
     if little_endian:
-      value = struct.unpack('<d', blob)[0]
+      value = _DOUBLE_LE.unpack(blob)[0]
     else:
-      value = struct.unpack('>d', blob)[0]
+      value = _DOUBLE_BE.unpack(blob)[0]
     return offset, value
 
   def DecodeFloat(self, little_endian: bool = True) -> Tuple[int, float]:
     """Returns a Tuple of the offset and a single-precision float."""
     offset, blob = self.ReadBytes(4)
     if little_endian:
-      value = struct.unpack('<f', blob)[0]
+      value = _FLOAT_LE.unpack(blob)[0]
     else:
-      value = struct.unpack('>f', blob)[0]
+      value = _FLOAT_BE.unpack(blob)[0]
     return offset, value
 
   def DecodeVarint(self, max_bytes: int = 10) -> Tuple[int, int]:
     """Returns a Tuple of the offset and the decoded base128 varint."""
     offset = self.stream.tell()
+    return offset, self.DecodeVarintValue(max_bytes)
+
+  def DecodeVarintValue(self, max_bytes: int = 10) -> int:
+    """Returns the decoded base128 varint without the offset."""
+    # most varints are one or two bytes, which do not need a seek.
+    buffer = self.stream.read(1)
+    if buffer and buffer[0] < 0x80:
+      return buffer[0]
+    if buffer and max_bytes > 1:
+      buffer += self.stream.read(1)
+      if len(buffer) == 2 and buffer[1] < 0x80:
+        return (buffer[0] & 0x7f) | (buffer[1] << 7)
+
+    offset = self.stream.tell() - len(buffer)
+    # read the maximum varint length in one call and seek back to the end of
+    # the varint once it has been decoded.
+    buffer += self.stream.read(max_bytes - len(buffer))
     varint = 0
-    for i in range(0, max_bytes*7, 7):
-      _, varint_part = self.ReadBytes(1)
-      varint |= (varint_part[0] & 0x7f) << i
-      if not varint_part[0] >> 7:
-        break
-    return offset, varint
+    for i, varint_part in enumerate(buffer):
+      varint |= (varint_part & 0x7f) << (i * 7)
+      if not varint_part >> 7:
+        self.stream.seek(offset + i + 1, os.SEEK_SET)
+        return varint
+    if len(buffer) != max_bytes:
+      raise errors.DecoderError(
+          f'Truncated varint of {len(buffer)} bytes at offset {offset}')
+    return varint
 
   def DecodeZigzagVarint(self, max_bytes: int = 10) -> Tuple[int, int]:
     """Returns a Tuple of the offset and the decoded zigzag varint."""
@@ -196,6 +258,10 @@ class StreamDecoder:
     """Decodes a variable unsigned 32-bit integer from the binary stream."""
     return self.DecodeVarint(max_bytes=5)
 
+  def DecodeUint32VarintValue(self) -> int:
+    """Returns a variable unsigned 32-bit integer without the offset."""
+    return self.DecodeVarintValue(max_bytes=5)
+
   def DecodeUint64Varint(self) -> Tuple[int, int]:
     """Decodes a variable unsigned 64-bit integer from the binary stream."""
     return self.DecodeVarint(max_bytes=10)
@@ -209,9 +275,6 @@ class StreamDecoder:
     return self.DecodeZigzagVarint(max_bytes=10)
 
 
-T = TypeVar('T')
-
-
 class FromDecoderMixin:
   """A mixin for parsing dataclass attributes using a StreamDecoder."""
 
@@ -259,8 +322,8 @@ class FromDecoderMixin:
     Returns:
       The class instance.
     """
-    stream = io.BytesIO(raw_data)
-    return cls.FromStream(stream=stream, base_offset=base_offset)
+    decoder = StreamDecoder.FromBytes(raw_data)
+    return cls.FromDecoder(decoder=decoder, base_offset=base_offset)
 
 
 def asdict(obj, *, dict_factory=dict):  # pylint: disable=invalid-name
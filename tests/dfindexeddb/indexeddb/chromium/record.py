@@ -14,10 +14,16 @@
 # limitations under the License.
 """Unit tests for Chromium IndexedDB encoded leveldb databases."""
 import datetime
+import itertools
+import pathlib
 import unittest
 
+from dfindexeddb import errors
 from dfindexeddb.indexeddb.chromium import record
 from dfindexeddb.indexeddb.chromium import definitions
+from dfindexeddb.leveldb import definitions as leveldb_definitions
+from dfindexeddb.leveldb import log
+from dfindexeddb.leveldb import record as leveldb_record_module
 
 
 class ChromiumIndexedDBTest(unittest.TestCase):
@@ -31,6 +37,40 @@ class ChromiumIndexedDBTest(unittest.TestCase):
     parsed_key_prefix = record.KeyPrefix.FromBytes(key_bytes)
     self.assertEqual(parsed_key_prefix, expected_key_prefix)
 
+  def test_parse_key_prefix_id_lengths(self):
+    """Tests the KeyPrefix class with multi-byte IDs."""
+    expected_key_prefix = record.KeyPrefix(
+        offset=0, database_id=0x0201, object_store_id=0x050403,
+        index_id=0x0706)
+    key_bytes = bytes.fromhex('29' '0102' '030405' '0607')
+    parsed_key_prefix = record.KeyPrefix.FromBytes(key_bytes)
+    self.assertEqual(parsed_key_prefix, expected_key_prefix)
+
+    with self.assertRaises(errors.DecoderError):
+      record.KeyPrefix.FromBytes(bytes.fromhex('290102'))
+
+  def test_key_prefix_type(self):
+    """Tests the KeyPrefix.GetKeyPrefixType method."""
+    test_cases = [
+        ((0, 0, 0), definitions.KeyPrefixType.GLOBAL_METADATA),
+        ((1, 0, 0), definitions.KeyPrefixType.DATABASE_METADATA),
+        ((1, 1, 1), definitions.KeyPrefixType.OBJECT_STORE_DATA),
+        ((1, 1, 2), definitions.KeyPrefixType.EXISTS_ENTRY),
+        ((1, 1, 3), definitions.KeyPrefixType.BLOB_ENTRY),
+        ((1, 1, 30), definitions.KeyPrefixType.INDEX_DATA)]
+    for (database_id, object_store_id, index_id), expected_type in test_cases:
+      with self.subTest(expected_type.name):
+        key_prefix = record.KeyPrefix(
+            offset=0, database_id=database_id,
+            object_store_id=object_store_id, index_id=index_id)
+        self.assertEqual(key_prefix.GetKeyPrefixType(), expected_type)
+
+    with self.subTest('unknown'):
+      key_prefix = record.KeyPrefix(
+          offset=0, database_id=1, object_store_id=1, index_id=4)
+      with self.assertRaises(errors.ParserError):
+        key_prefix.GetKeyPrefixType()
+
   def test_parse_idbkey(self):
     """Tests the IDBKey class."""
     expected_idbkey = record.IDBKey(
@@ -39,6 +79,51 @@ class ChromiumIndexedDBTest(unittest.TestCase):
     parsed_idbkey = record.IDBKey.FromBytes(key_bytes)
     self.assertEqual(parsed_idbkey, expected_idbkey)
 
+  def test_parse_idbkey_date(self):
+    """Tests the IDBKey class with a date value."""
+    expected_idbkey = record.IDBKey(
+        offset=0, type=definitions.IDBKeyType.DATE,
+        value=datetime.datetime(2263, 6, 18, 15, 17, 19, 883000))
+    key_bytes = bytes.fromhex('0200162fbe5fd8a042')
+    parsed_idbkey = record.IDBKey.FromBytes(key_bytes)
+    self.assertEqual(parsed_idbkey, expected_idbkey)
+
+  def test_parse_idbkey_array(self):
+    """Tests the IDBKey class with an array value."""
+    expected_idbkey = record.IDBKey(
+        offset=0, type=definitions.IDBKeyType.ARRAY, value=[2.0, None])
+    key_bytes = bytes.fromhex('0402030000000000000040' '00')
+    parsed_idbkey = record.IDBKey.FromBytes(key_bytes)
+    self.assertEqual(parsed_idbkey, expected_idbkey)
+
+  def test_parse_idbkey_nested_array(self):
+    """Tests the IDBKey class with nested array values."""
+    expected_idbkey = record.IDBKey(
+        offset=0, type=definitions.IDBKeyType.ARRAY,
+        value=[[2.0, []], 'a', [None]])
+    key_bytes = bytes.fromhex(
+        '0403' '0402030000000000000040' '0400' '01010061' '040100')
+    parsed_idbkey = record.IDBKey.FromBytes(key_bytes)
+    self.assertEqual(parsed_idbkey, expected_idbkey)
+
+  def test_parse_idbkey_invalid_type(self):
+    """Tests the IDBKey class with an invalid nested key type."""
+    key_bytes = bytes.fromhex('0401' '09')
+    with self.assertRaises(errors.ParserError):
+      record.IDBKey.FromBytes(key_bytes)
+
+  def test_parse_idbkey_maximum_depth(self):
+    """Tests the IDBKey class with arrays nested beyond the maximum depth."""
+    key_bytes = bytes.fromhex('0401') * 2000 + bytes.fromhex('00')
+    with self.assertRaises(RecursionError):
+      record.IDBKey.FromBytes(key_bytes)
+
+  def test_parse_idbkey_invalid_array_length(self):
+    """Tests the IDBKey class with an array length exceeding the data."""
+    key_bytes = bytes.fromhex('04ffffffff0f00')
+    with self.assertRaises(errors.ParserError):
+      record.IDBKey.FromBytes(key_bytes)
+
   def test_parse_idbkeypath(self):
     """Tests the IDBKeyPath class."""
     expected_key = record.IDBKeyPath(
@@ -47,6 +132,12 @@ class ChromiumIndexedDBTest(unittest.TestCase):
     parsed_key = record.IDBKeyPath.FromBytes(key_bytes)
     self.assertEqual(parsed_key, expected_key)
 
+    expected_key = record.IDBKeyPath(
+        offset=0, type=definitions.IDBKeyPathType.STRING, value='a')
+    key_bytes = bytes.fromhex('0061')
+    parsed_key = record.IDBKeyPath.FromBytes(key_bytes)
+    self.assertEqual(parsed_key, expected_key)
+
   def test_parse_blob_journal(self):
     """Tests the BlobJournal class"""
     expected_key = record.BlobJournal(
@@ -55,6 +146,14 @@ class ChromiumIndexedDBTest(unittest.TestCase):
     parsed_key = record.BlobJournal.FromBytes(key_bytes)
     self.assertEqual(parsed_key, expected_key)
 
+    expected_key = record.BlobJournal(
+        offset=0, entries=[
+            record.BlobJournalEntry(offset=0, database_id=1, blob_number=2),
+            record.BlobJournalEntry(offset=2, database_id=3, blob_number=4)])
+    key_bytes = bytes.fromhex('0102' '0304' '05')
+    parsed_key = record.BlobJournal.FromBytes(key_bytes)
+    self.assertEqual(parsed_key, expected_key)
+
   def test_schema_version_key(self):
     """Tests the SchemaVersionKey."""
     expected_key = record.SchemaVersionKey(
@@ -161,6 +260,11 @@ class ChromiumIndexedDBTest(unittest.TestCase):
     parsed_key = record.GlobalMetaDataKey.FromBytes(record_bytes[0])
     self.assertEqual(parsed_key, expected_key)
 
+  def test_unknown_global_metadata_key(self):
+    """Tests an unknown global metadata key type."""
+    with self.assertRaises(errors.ParserError):
+      record.GlobalMetaDataKey.FromBytes(bytes.fromhex('00000000ff'))
+
   def test_database_name_key(self):
     """Tests the DatabaseNameKey."""
     expected_key = record.DatabaseNameKey(
@@ -312,7 +416,7 @@ class ChromiumIndexedDBTest(unittest.TestCase):
           object_store_id=1,
           index_id=31,
           metadata_type=definitions.IndexMetaDataKeyType.UNIQUE_FLAG)
-      expected_value = True
+      expected_value = False
 
       record_bytes = (
             bytes.fromhex('0004000064011f01'), bytes.fromhex('00'))
@@ -355,7 +459,7 @@ class ChromiumIndexedDBTest(unittest.TestCase):
           object_store_id=1,
           index_id=31,
           metadata_type=definitions.IndexMetaDataKeyType.MULTI_ENTRY_FLAG)
-      expected_value = True
+      expected_value = False
 
       record_bytes = (bytes.fromhex('0004000064011f03'), bytes.fromhex('00'))
 
@@ -423,7 +527,7 @@ class ChromiumIndexedDBTest(unittest.TestCase):
           object_store_id=1,
           metadata_type=(definitions.ObjectStoreMetaDataKeyType
               .AUTO_INCREMENT_FLAG))
-      expected_value = True
+      expected_value = False
 
       record_bytes = (bytes.fromhex('00040000320102'), bytes.fromhex('00'))
 
@@ -443,7 +547,7 @@ class ChromiumIndexedDBTest(unittest.TestCase):
           object_store_id=1,
           metadata_type=(definitions.ObjectStoreMetaDataKeyType
               .IS_EVICTABLE))
-      expected_value = True
+      expected_value = False
 
       record_bytes = (bytes.fromhex('00040000320103'), bytes.fromhex('00'))
 
@@ -534,6 +638,11 @@ class ChromiumIndexedDBTest(unittest.TestCase):
       parsed_key = record.DatabaseMetaDataKey.FromBytes(record_bytes[0])
       self.assertEqual(expected_key, parsed_key)
 
+  def test_unknown_object_store_metadata_type(self):
+    """Tests an ObjectStoreMetaDataKey with an unknown metadata type."""
+    with self.assertRaises(errors.ParserError):
+      record.ObjectStoreMetaDataKey.FromBytes(bytes.fromhex('0004000032017f'))
+
   # def test_object_store_free_list_key(self):
   #   """Tests the ObjectStoreFreeListKey"""
   #   pass
@@ -616,6 +725,9 @@ class ChromiumIndexedDBTest(unittest.TestCase):
     parsed_key = record.IndexedDbKey.FromBytes(record_bytes[0])
     self.assertEqual(parsed_key, expected_key)
 
+    parsed_value = parsed_key.ParseValue(bytes.fromhex('0201000000000000'))
+    self.assertEqual(parsed_value, 258)
+
   def test_index_data_key(self):
     """Tests the IndexDataKey."""
     expected_key = record.IndexDataKey(
@@ -685,6 +797,85 @@ class ChromiumIndexedDBTest(unittest.TestCase):
     parsed_key = record.IndexedDbKey.FromBytes(record_bytes[0])
     self.assertEqual(parsed_key, expected_key)
 
+  def test_indexeddb_record_parse_value_for(self):
+    """Tests IndexedDBRecord.FromLevelDBRecord with parse_value_for."""
+    leveldb_record = leveldb_record_module.LevelDBRecord(
+        path='test.log',
+        record=log.ParsedInternalKey(
+            offset=0,
+            record_type=leveldb_definitions.InternalRecordType.VALUE,
+            sequence_number=1,
+            key=bytes.fromhex('0000000000'),
+            value=bytes.fromhex('05')))
+
+    with self.subTest('all values'):
+      idb_record = record.IndexedDBRecord.FromLevelDBRecord(leveldb_record)
+      self.assertIsInstance(idb_record.key, record.SchemaVersionKey)
+      self.assertEqual(idb_record.value, 5)
+
+    with self.subTest('matching key class'):
+      idb_record = record.IndexedDBRecord.FromLevelDBRecord(
+          leveldb_record, parse_value_for={record.SchemaVersionKey})
+      self.assertEqual(idb_record.value, 5)
+
+    with self.subTest('other key class'):
+      idb_record = record.IndexedDBRecord.FromLevelDBRecord(
+          leveldb_record, parse_value_for={record.ObjectStoreDataKey})
+      self.assertIsInstance(idb_record.key, record.SchemaVersionKey)
+      self.assertIsNone(idb_record.value)
+
+  def test_folder_reader_workers(self):
+    """Tests FolderReader.GetRecords with worker processes."""
+    folder_reader = record.FolderReader(pathlib.Path(
+        'test_data/indexeddb/chrome/linux_109_64/'
+        'file__0.indexeddb.leveldb'))
+    expected_records = list(folder_reader.GetRecords())
+
+    with self.subTest('all records'):
+      parsed_records = list(folder_reader.GetRecords(workers=2))
+      self.assertEqual(parsed_records, expected_records)
+
+    with self.subTest('early exit'):
+      idb_records = folder_reader.GetRecords(workers=2)
+      parsed_records = list(itertools.islice(idb_records, 3))
+      idb_records.close()
+      self.assertEqual(parsed_records, expected_records[:3])
+
+  def test_parse_error_logged_by_caller(self):
+    """Tests that worker parse errors are returned and logged by the caller."""
+    leveldb_record = leveldb_record_module.LevelDBRecord(
+        path='test.log',
+        record=log.ParsedInternalKey(
+            offset=0,
+            record_type=leveldb_definitions.InternalRecordType.VALUE,
+            sequence_number=1,
+            key=bytes.fromhex('00010104'),
+            value=b''))
+
+    with self.subTest('worker'):
+      results = record._TryParseLevelDBRecords(  # pylint: disable=protected-access
+          [leveldb_record])
+      self.assertEqual(len(results), 1)
+      self.assertIsInstance(
+          results[0], record._RecordParseError)  # pylint: disable=protected-access
+      self.assertIsNone(results[0].traceback)
+
+      with self.assertLogs(level='WARNING') as logs:
+        self.assertIsNone(record._CheckParseResult(  # pylint: disable=protected-access
+            results[0]))
+      self.assertIn('at offset 0 in test.log', logs.output[0])
+
+    with self.subTest('worker with traceback'):
+      results = record._TryParseLevelDBRecords(  # pylint: disable=protected-access
+          [leveldb_record], include_traceback=True)
+      self.assertIn('ParserError', results[0].traceback)
+
+    with self.subTest('serial'):
+      with self.assertLogs(level='WARNING') as logs:
+        self.assertIsNone(record._ParseLevelDBRecord(  # pylint: disable=protected-access
+            leveldb_record))
+      self.assertIn('at offset 0 in test.log', logs.output[0])
+
 
 if __name__ == '__main__':
   unittest.main()
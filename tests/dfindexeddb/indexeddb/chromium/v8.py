@@ -16,6 +16,7 @@
 from datetime import datetime
 import unittest
 
+from dfindexeddb import errors
 from dfindexeddb.indexeddb import types
 from dfindexeddb.indexeddb.chromium import definitions
 from dfindexeddb.indexeddb.chromium import v8
@@ -50,6 +51,12 @@ class V8Test(unittest.TestCase):
       parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
       self.assertEqual(parsed_value, False)
 
+  def test_invalid_tag(self):
+    """Tests an invalid serialization tag."""
+    buffer = bytes.fromhex('ff0d01')
+    with self.assertRaises(errors.ParserError):
+      v8.ValueDeserializer.FromBytes(buffer, None)
+
   def test_int(self):
     """Tests int decoding."""
 
@@ -132,6 +139,20 @@ class V8Test(unittest.TestCase):
       parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
       self.assertEqual(parsed_value, expected_value)
 
+    with self.subTest('high bit set'):
+      # console.log(v8.serialize(2n ** 63n).toString('hex'))
+      buffer = bytes.fromhex('ff0d5a100000000000000080')
+      expected_value = 2 ** 63
+      parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
+      self.assertEqual(parsed_value, expected_value)
+
+    with self.subTest('multiple digits'):
+      # console.log(v8.serialize(-(2n ** 64n)).toString('hex'))
+      buffer = bytes.fromhex('ff0d5a2100000000000000000100000000000000')
+      expected_value = -(2 ** 64)
+      parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
+      self.assertEqual(parsed_value, expected_value)
+
   def test_jsobject(self):
     """Tests object decoding."""
 
@@ -149,6 +170,19 @@ class V8Test(unittest.TestCase):
       parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
       self.assertEqual(parsed_value, expected_value)
 
+    with self.subTest('repeated property keys'):
+      # console.log(v8.serialize([{'propa': 1}, {'propa': 2}]).toString('hex'))
+      buffer = bytes.fromhex(
+          'ff0d4102'
+          '6f220570726f706149027b01'
+          '6f220570726f706149047b01'
+          '240002')
+      parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
+      self.assertEqual(parsed_value.values, [{'propa': 1}, {'propa': 2}])
+      first_key = next(iter(parsed_value.values[0]))
+      second_key = next(iter(parsed_value.values[1]))
+      self.assertIs(first_key, second_key)
+
   def test_jsarray(self):
     """Tests array decoding."""
 
@@ -184,6 +218,19 @@ class V8Test(unittest.TestCase):
       parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
       self.assertEqual(parsed_value, expected_value)
 
+    with self.subTest('dense with hole'):
+      # console.log(v8.serialize([1, , 3]).toString('hex'))
+      buffer = bytes.fromhex('ff0f410349022d4906240003')
+      expected_value = types.JSArray()
+      expected_value.values.extend([1, 3])
+      parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
+      self.assertEqual(parsed_value, expected_value)
+
+    with self.subTest('invalid dense length'):
+      buffer = bytes.fromhex('ff0d410a2400')
+      with self.assertRaises(errors.ParserError):
+        v8.ValueDeserializer.FromBytes(buffer, None)
+
   def test_jsmap(self):
     """Tests map decoding."""
 
@@ -257,6 +304,13 @@ class V8Test(unittest.TestCase):
     parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
     self.assertEqual(parsed_value, expected_value)
 
+    # console.log(
+    #     v8.serialize(new Date('1960-01-01T00:00:00Z')).toString('hex'))
+    buffer = bytes.fromhex('ff0d44000000b3175f52c2')
+    expected_value = datetime(1960, 1, 1)
+    parsed_value = v8.ValueDeserializer.FromBytes(buffer, None)
+    self.assertEqual(parsed_value, expected_value)
+
   def test_wrapped_primitives(self):
     """Tests wrapped primitive types."""
 
@@ -16,6 +16,7 @@
 import io
 import unittest
 
+from dfindexeddb import errors
 from dfindexeddb.leveldb import utils
 
 
@@ -31,6 +32,13 @@ class LevelDBDecoderTest(unittest.TestCase):
     self.assertEqual(offset, 0)
     self.assertEqual(result, True)
 
+    data = b'\x00'
+    stream = io.BytesIO(data)
+    decoder = utils.LevelDBDecoder(stream)
+    offset, result = decoder.DecodeBool()
+    self.assertEqual(offset, 0)
+    self.assertEqual(result, False)
+
   def test_decode_string(self):
     """Tests the decode_string method."""
     data = b'\x00a\x00b'
@@ -40,6 +48,19 @@ class LevelDBDecoderTest(unittest.TestCase):
     self.assertEqual(offset, 0)
     self.assertEqual(result, 'ab')
 
+  def test_decode_value_methods(self):
+    """Tests the decode_bool_value and decode_string_value methods."""
+    with self.subTest('bool'):
+      decoder = utils.LevelDBDecoder(io.BytesIO(b'\x01\x00'))
+      self.assertTrue(decoder.DecodeBoolValue())
+      self.assertFalse(decoder.DecodeBoolValue())
+      with self.assertRaises(errors.DecoderError):
+        decoder.DecodeBoolValue()
+
+    with self.subTest('string'):
+      decoder = utils.LevelDBDecoder(io.BytesIO(b'\x00a\x00b'))
+      self.assertEqual(decoder.DecodeStringValue(), 'ab')
+
   def test_decode_blob_with_length(self):
     """Tests the decode_blob_with_length method."""
     data = b'\x02\x00a'
@@ -31,6 +31,13 @@ class TestStreamDecoder(unittest.TestCase):
     decoder = utils.StreamDecoder(stream)
     self.assertEqual(decoder.stream, stream)
 
+  def test_from_bytes(self):
+    """Tests the FromBytes method."""
+    decoder = utils.StreamDecoder.FromBytes(b'\x01\x02\x03')
+    self.assertEqual(decoder.NumRemainingBytes(), 3)
+    self.assertEqual(decoder.DecodeUint8(), (0, 1))
+    self.assertEqual(decoder.NumRemainingBytes(), 2)
+
   def test_num_remaining_bytes(self):
     """Tests the num_remaining_bytes method."""
     data = b'test'
@@ -89,6 +96,14 @@ class TestStreamDecoder(unittest.TestCase):
       self.assertEqual(offset, 0)
       self.assertEqual(result, 123456789)
 
+  def test_decode_int_value(self):
+    """Tests the decode_int_value method."""
+    data = struct.pack('<i', -123456789)
+    stream = io.BytesIO(data)
+    decoder = utils.StreamDecoder(stream)
+    self.assertEqual(decoder.DecodeIntValue(), -123456789)
+    self.assertEqual(decoder.stream.tell(), 4)
+
   def test_decode_uint8(self):
     """Tests the decode_uint8 method."""
     data = struct.pack('B', 123)
@@ -225,6 +240,55 @@ class TestStreamDecoder(unittest.TestCase):
     self.assertEqual(offset, 0)
     self.assertEqual(result, expected_result)
 
+  def test_decode_varint_position(self):
+    """Tests the decode_varint method leaves the stream after the varint."""
+    stream = io.BytesIO(b'\x80\x80\x01\x05\x06')
+    decoder = utils.StreamDecoder(stream)
+    offset, result = decoder.DecodeVarint()
+    self.assertEqual(offset, 0)
+    self.assertEqual(result, 16384)
+    self.assertEqual(decoder.stream.tell(), 3)
+    self.assertEqual(decoder.DecodeVarint(), (3, 5))
+
+  def test_decode_varint_value(self):
+    """Tests the decode_varint_value method."""
+    stream = io.BytesIO(b'\x80\x80\x01\x05')
+    decoder = utils.StreamDecoder(stream)
+    self.assertEqual(decoder.DecodeVarintValue(), 16384)
+    self.assertEqual(decoder.DecodeVarintValue(), 5)
+
+  def test_decode_uint32_varint_value(self):
+    """Tests the decode_uint32_varint_value method."""
+    stream = io.BytesIO(b'\xff\xff\xff\xff\x0f\x05')
+    decoder = utils.StreamDecoder(stream)
+    self.assertEqual(decoder.DecodeUint32VarintValue(), 0xffffffff)
+    self.assertEqual(decoder.DecodeUint32VarintValue(), 5)
+
+  def test_decode_varint_lengths(self):
+    """Tests the decode_varint method with varints of different lengths."""
+    test_cases = [
+        (b'\x05', 5),
+        (b'\xac\x02', 300),
+        (b'\x80\x80\x01', 16384),
+        (b'\xff\xff\xff\xff\x0f', 0xffffffff)]
+    for varint_bytes, expected_result in test_cases:
+      with self.subTest(expected_result):
+        decoder = utils.StreamDecoder(io.BytesIO(varint_bytes + b'\x01'))
+        self.assertEqual(decoder.DecodeVarint(), (0, expected_result))
+        self.assertEqual(decoder.stream.tell(), len(varint_bytes))
+
+    with self.subTest('truncated'):
+      decoder = utils.StreamDecoder(io.BytesIO(b'\x80'))
+      with self.assertRaises(errors.DecoderError):
+        decoder.DecodeVarint()
+
+  def test_decode_truncated_varint(self):
+    """Tests the decode_varint method with a truncated varint."""
+    stream = io.BytesIO(b'\x80\x80')
+    decoder = utils.StreamDecoder(stream)
+    with self.assertRaises(errors.DecoderError):
+      decoder.DecodeVarint()
+
   def test_decode_zigzag_varint(self):
     """Tests the decode_zigzag_varint method."""
     varint_bytes = b'\x80\x80\x01'